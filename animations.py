@@ -1,85 +1,91 @@
-import random
+import math
 import time
 from datetime import datetime
-from config import CHAR_LIMIT
-import subprocess
-import sys
+from config import CHAR_LIMIT, SENSOR_STALE_S, RADAR_RINGS, RADAR_TRAIL, PARTICLE_ENGINE, NUMPY_MIN_CELLS
+from sensors import SensorHub, CpuSampler
+from frame_cache import FrameCache
+from framebuffer import FrameBuffer
+from random_streams import RandomStreams
+from gpu import create_gpu_backend
+from temperature import TemperatureReader
+from registry import animation, composite, get_spec, COST_MEDIUM, COST_IO
+from lazy import installed, load
+from glyphs import JAPANESE_CHARS, RAIN_CHARS, FIRE_CHARS, SNOWFLAKE_CHARS, SPARKLE_CHARS, ANIME_SPARKLE_CHARS
 
-try:
-    import psutil
-    HAS_PSUTIL = True
-except ImportError:
-    HAS_PSUTIL = False
+HAS_PSUTIL = installed("psutil")
 
-try:
-    import struct
-    import mmap
-    HAS_MMAP = True
-except ImportError:
-    HAS_MMAP = False
-
-try:
-    import wmi
-    import pythoncom
-    HAS_WMI = True
-except ImportError:
-    HAS_WMI = False
-
-def get_gpu_info():
-    try:
-        if sys.platform == "win32":
-            si = subprocess.STARTUPINFO()
-            si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            si.wShowWindow = subprocess.SW_HIDE
-            
-            result = subprocess.run(
-                ["nvidia-smi", "--query-gpu=utilization.gpu,temperature.gpu,name", "--format=csv,noheader,nounits"],
-                capture_output=True,
-                text=True,
-                startupinfo=si,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-        else:
-            result = subprocess.run(
-                ["nvidia-smi", "--query-gpu=utilization.gpu,temperature.gpu,name", "--format=csv,noheader,nounits"],
-                capture_output=True,
-                text=True
-            )
-        
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
-            if lines and lines[0]:
-                values = lines[0].split(', ')
-                if len(values) >= 3:
-                    return {
-                        "load": float(values[0]) / 100,
-                        "temperature": float(values[1]),
-                        "name": values[2]
-                    }
-    except:
-        pass
-    
-    return None
+SNOW_DRIFT = (-1, 0, 1)
+CAT_WALK_FRAMES = (
+    ("∧_∧", "(='.'=)", "(¨)_(¨)"),
+    ("∧_∧", "(='.'=)", "(_¨)(¨)"),
+    ("∧_∧", "(='.'=)", "(¨)_(¨)"),
+    ("∧_∧", "(='.'=)", "(¨)(_¨)"),
+)
+MOUSE_FRAMES = (
+    ("", "ᘛ⁐ᕐᐷ...", ""),
+    ("", ".ᘛ⁐ᕐᐷ..", ""),
+    ("", "..ᘛ⁐ᕐᐷ.", ""),
+)
 
 class AnimationFunctions:
-    def __init__(self):
+    def __init__(self, seed=None, gpu_factory=create_gpu_backend):
+        self.random = RandomStreams(seed)
+        self.gpu_factory = gpu_factory
+        self.frame_cache = FrameCache()
+        self.radar_rings = RADAR_RINGS
+        self.radar_trail = RADAR_TRAIL
+        self.particles = self.create_particle_engine()
         self.reset_all()
         self.mouse_position = -10
         self._last_net_recv = 0
         self._last_net_sent = 0
         self._last_net_time = time.time()
-        self._wmi_initialized = False
-        self._wmi_lock = False
+        
+        self.gpu = None
+        self.temperature = TemperatureReader()
+        self.cpu_sampler = CpuSampler()
+        self.cpu_graph_sampler = CpuSampler()
+        self.sensors = SensorHub()
+        self.sensors.add_source("gpu", self.sample_gpu, 1.0, self.close_gpu)
+        self.sensors.add_source("cpu_temp", self.get_cpu_temperature, 2.0)
+        if HAS_PSUTIL:
+            self.sensors.add_source("cpu", self.sample_cpu, 1.0)
+            self.sensors.add_source("ram", self.sample_ram, 1.0)
+            self.sensors.add_source("net", self.sample_network_speed, 1.0)
+            self.sensors.add_source("boot_time", lambda: load("psutil").boot_time(), 60.0)
+    
+    def create_particle_engine(self):
+        # NumPy only pays off on large grids; on the 15x3 OLED the Python path is faster
+        if PARTICLE_ENGINE == "python":
+            return None
+        if PARTICLE_ENGINE == "auto" and CHAR_LIMIT * 3 < NUMPY_MIN_CELLS:
+            return None
+        
+        from particles import HAS_NUMPY, NumpyParticleEngine
+        if not HAS_NUMPY:
+            return None
+        return NumpyParticleEngine(CHAR_LIMIT, seed=self.random.seed)
+    
+    def rng(self, name):
+        return self.random.get(name)
+    
+    def reseed(self, seed=None):
+        self.random.reseed(seed)
+        self.reset_all()
+        return self.random.seed
     
     def reset_all(self):
+        self.random.rewind()
+        if self.particles is not None:
+            self.particles.reset(self.random.seed)
         self.cpu_history = [0] * CHAR_LIMIT
-        self.japanese_rain = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        self.japanese_chars = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
-        self.rain_positions = [random.randint(0, 10) for _ in range(CHAR_LIMIT)]
+        self.buffers = {}
+        self.japanese_rain = FrameBuffer(CHAR_LIMIT)
+        self.rain_positions = [self.rng("japanese_rain").randint(0, 10) for _ in range(CHAR_LIMIT)]
         self.pulse_state = 0
         self.sparkle_positions = set()
         self.rainbow_offset = 0
-        self.fire_state = [[0 for _ in range(CHAR_LIMIT)] for _ in range(3)]
+        self.fire_state = [0] * (CHAR_LIMIT * 3)
         self.wave_offset = 0
         self.loading_pos = 0
         self.glitch_counter = 0
@@ -89,13 +95,14 @@ class AnimationFunctions:
             "GG EZ", "HEADSHOT!", "VICTORY!", "FLAWLESS", "DOMINATED",
             "LEGENDARY", "GODLIKE", "UNSTOPPABLE", "RAMPAGE", "SAVAGE"
         ]
-        self.current_typing_msg = random.choice(self.typing_messages)
+        self.current_typing_msg = self.rng("typing").choice(self.typing_messages)
         self.binary_offset = 0
         self.snake_segments = [(1, 7)]
         self.snake_direction = 1
-        self.regular_rain = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        self.rain_drops = [random.randint(0, 10) for _ in range(CHAR_LIMIT)]
-        self.snow_positions = [(random.randint(0, 2), random.randint(0, CHAR_LIMIT-1)) for _ in range(5)]
+        self.regular_rain = FrameBuffer(CHAR_LIMIT)
+        self.rain_drops = [self.rng("regular_rain").randint(0, 10) for _ in range(CHAR_LIMIT)]
+        snow_rng = self.rng("snowflake")
+        self.snow_positions = [(snow_rng.randint(0, 2), snow_rng.randint(0, CHAR_LIMIT-1)) for _ in range(5)]
         self.snow_counter = 0
         self.anime_face = 0
         self.anime_sparkle_pos = []
@@ -104,6 +111,34 @@ class AnimationFunctions:
         self.mouse_position = CHAR_LIMIT - 1
         self.mouse_frame = 0
     
+    def cycle(self, name):
+        key = name
+        if name == "radar":
+            key = f"radar:{self.radar_rings}:{self.radar_trail}"
+        return self.frame_cache.frames(key, getattr(self, f"render_{name}_cycle"))
+    
+    def resolve(self, spec):
+        if spec.kind == "composite":
+            from compositor import create_composite
+            return create_composite(spec, self.resolve)
+        if spec.module is not None:
+            from plugins import create_plugin_animation
+            return create_plugin_animation(spec, self)
+        return getattr(self, spec.func)
+    
+    def prewarm(self, spec):
+        if spec.cacheable:
+            self.cycle(spec.cycle)
+        for layer in spec.layers:
+            self.prewarm(get_spec(layer["func"]))
+    
+    def buffer(self, name):
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            buffer = self.buffers[name] = FrameBuffer(CHAR_LIMIT)
+        return buffer
+    
+    @animation(preset_id="clock", name="Clock", category="System", kind="dynamic", period=1.0)
     def show_clock(self):
         now = datetime.now()
         return [
@@ -112,56 +147,88 @@ class AnimationFunctions:
             now.strftime("%d %B %Y")[:CHAR_LIMIT]
         ]
     
+    def sample_gpu(self):
+        # Backend is picked on first use, on the sensor thread, so probing never blocks the UI
+        if self.gpu is None:
+            self.gpu = self.gpu_factory()
+            print(f"GPU backend: {self.gpu.name}")
+        return self.gpu.read()
+    
+    def close_gpu(self):
+        # Stops the nvidia-smi loop or shuts NVML down; the next sample picks a backend again
+        gpu, self.gpu = self.gpu, None
+        if gpu is not None:
+            gpu.close()
+    
+    def close(self):
+        self.close_gpu()
+    
+    def sample_cpu(self):
+        return self.cpu_sampler.sample()
+    
+    def sample_ram(self):
+        return load("psutil").virtual_memory().percent
+    
+    def sample_network_speed(self):
+        net_io = load("psutil").net_io_counters()
+        current_time = time.time()
+        time_delta = current_time - self._last_net_time
+        
+        if time_delta > 0 and self._last_net_recv:
+            recv_speed = (net_io.bytes_recv - self._last_net_recv) / time_delta / 1024 / 1024
+            sent_speed = (net_io.bytes_sent - self._last_net_sent) / time_delta / 1024 / 1024
+            net_speed = recv_speed + sent_speed
+        else:
+            net_speed = 0
+        
+        self._last_net_recv = net_io.bytes_recv
+        self._last_net_sent = net_io.bytes_sent
+        self._last_net_time = current_time
+        return net_speed
+    
+    @animation(preset_id="gpu_cpu_ram", name="GPU, CPU & RAM", category="System", kind="dynamic", period=1.0,
+               sensors=("gpu", "cpu", "ram"), cost=COST_IO)
     def show_gpu_cpu_ram(self):
         if HAS_PSUTIL:
             try:
-                cpu = psutil.cpu_percent(interval=0.1)
-                mem = psutil.virtual_memory()
+                cpu = self.sensors.get("cpu", SENSOR_STALE_S)
+                mem = self.sensors.get("ram", SENSOR_STALE_S)
+                gpu_info = self.sensors.get("gpu", SENSOR_STALE_S)
                 
                 gpu_text = "GPU: N/A"
-                gpu_info = get_gpu_info()
                 if gpu_info:
                     gpu_text = f"GPU: {gpu_info['load'] * 100:.0f}%"
                 
                 return [
                     gpu_text,
-                    f"CPU: {cpu:.0f}%",
-                    f"RAM: {mem.percent:.0f}%"
+                    f"CPU: {cpu:.0f}%" if cpu is not None else "CPU: N/A",
+                    f"RAM: {mem:.0f}%" if mem is not None else "RAM: N/A"
                 ]
             except Exception as e:
                 return ["System Error", str(e)[:15], ""]
         else:
             return ["Install psutil", "pip install", "psutil"]
     
+    @animation(preset_id="ram_net_uptime", name="RAM, NETWORK & UPTIME", category="System", kind="dynamic", period=1.0,
+               sensors=("ram", "net", "boot_time"), cost=COST_IO)
     def show_ram_network_uptime(self):
         if HAS_PSUTIL:
             try:
-                mem = psutil.virtual_memory()
-                
-                net_io = psutil.net_io_counters()
-                current_time = time.time()
-                time_delta = current_time - self._last_net_time
-                
-                if time_delta > 0:
-                    recv_speed = (net_io.bytes_recv - self._last_net_recv) / time_delta / 1024 / 1024
-                    sent_speed = (net_io.bytes_sent - self._last_net_sent) / time_delta / 1024 / 1024
-                    net_speed = recv_speed + sent_speed
-                else:
-                    net_speed = 0
+                mem = self.sensors.get("ram", SENSOR_STALE_S)
+                net_speed = self.sensors.get("net", SENSOR_STALE_S)
+                boot_time = self.sensors.get("boot_time")
                 
-                self._last_net_recv = net_io.bytes_recv
-                self._last_net_sent = net_io.bytes_sent
-                self._last_net_time = current_time
-                
-                boot_time = psutil.boot_time()
-                uptime = time.time() - boot_time
-                hours = int(uptime // 3600)
-                mins = int((uptime % 3600) // 60)
+                uptime_text = "UP: N/A"
+                if boot_time is not None:
+                    uptime = time.time() - boot_time
+                    hours = int(uptime // 3600)
+                    mins = int((uptime % 3600) // 60)
+                    uptime_text = f"UP: {hours}h {mins}m"
                 
                 return [
-                    f"RAM: {mem.percent:.0f}%",
-                    f"NET: {net_speed:.1f} MB/s",
-                    f"UP: {hours}h {mins}m"
+                    f"RAM: {mem:.0f}%" if mem is not None else "RAM: N/A",
+                    f"NET: {net_speed:.1f} MB/s" if net_speed is not None else "NET: N/A",
+                    uptime_text
                 ]
             except Exception as e:
                 return ["Error", str(e)[:15], ""]
@@ -169,121 +236,19 @@ class AnimationFunctions:
             return ["Install psutil", "pip install", "psutil"]
     
     def get_cpu_temperature(self):
-        if HAS_WMI and sys.platform == "win32":
-            try:
-                import threading
-                current_thread = threading.current_thread()
-                
-                if not hasattr(current_thread, '_com_initialized'):
-                    pythoncom.CoInitialize()
-                    current_thread._com_initialized = True
-                
-                c = wmi.WMI(namespace="root\\OpenHardwareMonitor")
-                cpu_temps = []
-                
-                for sensor in c.Sensor():
-                    if sensor.SensorType == "Temperature":
-                        if any(keyword in sensor.Name.upper() for keyword in ["CPU", "CORE", "PROCESSOR"]):
-                            temp = float(sensor.Value)
-                            if 0 < temp < 150:
-                                cpu_temps.append(temp)
-                
-                if cpu_temps:
-                    return sum(cpu_temps) / len(cpu_temps)
-                    
-            except:
-                pass
-        
-        if HAS_WMI and sys.platform == "win32":
-            try:
-                import threading
-                current_thread = threading.current_thread()
-                
-                if not hasattr(current_thread, '_com_initialized'):
-                    pythoncom.CoInitialize()
-                    current_thread._com_initialized = True
-                
-                c = wmi.WMI(namespace="root\\wmi")
-                for thermal in c.MSAcpi_ThermalZoneTemperature():
-                    temp = thermal.CurrentTemperature / 10.0 - 273.15
-                    if 0 < temp < 150:
-                        return temp
-            except:
-                pass
-        
-        if HAS_PSUTIL:
-            try:
-                if hasattr(psutil, "sensors_temperatures"):
-                    temps = psutil.sensors_temperatures()
-                    if temps:
-                        for name, entries in temps.items():
-                            if any(keyword in name.upper() for keyword in ["CPU", "CORE", "PROCESSOR"]):
-                                for entry in entries:
-                                    temp = entry.current
-                                    if 0 < temp < 150:
-                                        return temp
-            except:
-                pass
-        
-        try:
-            for i in range(10):
-                try:
-                    with open(f"/sys/class/thermal/thermal_zone{i}/temp", 'r') as f:
-                        temp = int(f.read().strip()) / 1000.0
-                        if 0 < temp < 150:
-                            return temp
-                except:
-                    continue
-        except:
-            pass
-        
-        if sys.platform == "win32" and HAS_MMAP:
-            try:
-                with mmap.mmap(-1, 1024, tagname="CoreTempMappingObject", access=mmap.ACCESS_READ) as mm:
-                    mm.seek(0)
-                    data = mm.read(256)
-                    if len(data) >= 256:
-                        cpu_count = struct.unpack('I', data[0:4])[0]
-                        if cpu_count > 0 and cpu_count < 64:
-                            temp_data_start = 160
-                            temp = struct.unpack('f', data[temp_data_start:temp_data_start+4])[0]
-                            if 0 < temp < 150:
-                                return temp
-            except:
-                pass
-        
-        if sys.platform == "win32" and HAS_MMAP:
-            try:
-                with mmap.mmap(-1, 10240, tagname="HWiNFO_SENSORS_SM2", access=mmap.ACCESS_READ) as mm:
-                    mm.seek(0)
-                    header = mm.read(16)
-                    if len(header) >= 16:
-                        signature = header[:4]
-                        if signature == b'HWiS':
-                            sensor_count = struct.unpack('I', header[8:12])[0]
-                            for i in range(min(sensor_count, 100)):
-                                sensor_offset = 16 + i * 88
-                                mm.seek(sensor_offset + 4)
-                                sensor_name = mm.read(64).decode('ascii', errors='ignore').strip('\x00')
-                                if 'CPU' in sensor_name.upper() and 'TEMP' in sensor_name.upper():
-                                    mm.seek(sensor_offset + 76)
-                                    temp = struct.unpack('d', mm.read(8))[0]
-                                    if 0 < temp < 150:
-                                        return temp
-            except:
-                pass
-        
-        return None
+        return self.temperature.read()
     
+    @animation(preset_id="temperatures", name="Temperatures", category="System", kind="dynamic", period=2.0,
+               sensors=("cpu_temp", "gpu"), cost=COST_IO)
     def show_temperatures(self):
         cpu_temp = "CPU: N/A"
         gpu_temp = "GPU: N/A"
         
-        cpu_temperature = self.get_cpu_temperature()
+        cpu_temperature = self.sensors.get("cpu_temp", SENSOR_STALE_S)
         if cpu_temperature:
             cpu_temp = f"CPU: {int(cpu_temperature)}°C"
         
-        gpu_info = get_gpu_info()
+        gpu_info = self.sensors.get("gpu", SENSOR_STALE_S)
         if gpu_info and 'temperature' in gpu_info:
             gpu_temp = f"GPU: {gpu_info['temperature']:.0f}°C"
         
@@ -293,13 +258,14 @@ class AnimationFunctions:
             "Temperatures"
         ]
     
+    @animation(period=2.0, sensors=("gpu", "cpu", "ram"), cost=COST_IO)
     def show_system(self):
         return self.show_gpu_cpu_ram()
     
     def get_uptime(self):
         if HAS_PSUTIL:
             try:
-                boot_time = psutil.boot_time()
+                boot_time = load("psutil").boot_time()
                 uptime = time.time() - boot_time
                 hours = int(uptime // 3600)
                 mins = int((uptime % 3600) // 60)
@@ -309,10 +275,11 @@ class AnimationFunctions:
         else:
             return "N/A"
     
+    @animation(period=1.0, cost=COST_IO)
     def show_cpu_graph(self):
         if HAS_PSUTIL:
             try:
-                cpu = psutil.cpu_percent(interval=0.5)
+                cpu = self.cpu_graph_sampler.sample()
                 self.cpu_history.pop(0)
                 self.cpu_history.append(int(cpu / 12.5))
                 
@@ -331,6 +298,7 @@ class AnimationFunctions:
         else:
             return ["CPU Graph", "Install psutil", "pip install psutil"]
     
+    @animation(period=5.0, cost=COST_IO)
     def show_network(self):
         try:
             import socket
@@ -345,208 +313,315 @@ class AnimationFunctions:
         except:
             return ["Network Info", "Disconnected", ""]
     
+    @animation(preset_id="japanese_rain", name="Matrix Rain", category="Animations", deterministic=True, cost=COST_MEDIUM)
     def japanese_rain_animation(self):
+        if self.particles is not None:
+            return self.particles.japanese_rain()
+        
+        rng = self.rng("japanese_rain")
+        rain = self.japanese_rain
         for col in range(CHAR_LIMIT):
             if self.rain_positions[col] > 0:
                 if self.rain_positions[col] <= 3:
                     row = self.rain_positions[col] - 1
-                    self.japanese_rain[row][col] = random.choice(self.japanese_chars)
+                    rain.set(row, col, rng.choice(JAPANESE_CHARS))
                 
                 if self.rain_positions[col] > 1 and self.rain_positions[col] <= 4:
                     prev_row = self.rain_positions[col] - 2
                     if prev_row >= 0:
-                        self.japanese_rain[prev_row][col] = ' '
+                        rain.set(prev_row, col, ' ')
                 
                 self.rain_positions[col] += 1
                 
                 if self.rain_positions[col] > 6:
                     self.rain_positions[col] = 0
-                    for row in range(3):
-                        self.japanese_rain[row][col] = ' '
+                    rain.clear_column(col)
             else:
-                if random.random() > 0.7:
+                if rng.random() > 0.7:
                     self.rain_positions[col] = 1
         
-        return [''.join(row) for row in self.japanese_rain]
+        return rain.to_lines()
     
+    @animation(preset_id="regular_rain", name="Rain", category="Animations", deterministic=True, cost=COST_MEDIUM)
+    def regular_rain_animation(self):
+        if self.particles is not None:
+            return self.particles.regular_rain()
+        
+        rng = self.rng("regular_rain")
+        rain = self.regular_rain
+        
+        for col in range(CHAR_LIMIT):
+            if self.rain_drops[col] > 0:
+                if self.rain_drops[col] <= 3:
+                    row = self.rain_drops[col] - 1
+                    rain.set(row, col, rng.choice(RAIN_CHARS))
+                
+                if self.rain_drops[col] > 1 and self.rain_drops[col] <= 4:
+                    prev_row = self.rain_drops[col] - 2
+                    if prev_row >= 0:
+                        rain.set(prev_row, col, ' ')
+                
+                self.rain_drops[col] += 1
+                
+                if self.rain_drops[col] > 6:
+                    self.rain_drops[col] = 0
+                    rain.clear_column(col)
+            else:
+                if rng.random() > 0.8:
+                    self.rain_drops[col] = 1
+        
+        return rain.to_lines()
+    
+    @animation(preset_id="snowflake", name="Snowflakes", category="Animations", deterministic=True)
+    def snowflake_animation(self):
+        if self.particles is not None:
+            return self.particles.snowflake()
+        
+        rng = self.rng("snowflake")
+        grid = self.buffer("snowflake")
+        grid.clear()
+        
+        self.snow_counter += 1
+        
+        new_positions = []
+        for row, col in self.snow_positions:
+            new_row = row + 1
+            if self.snow_counter % 2 == 0:
+                new_col = col + rng.choice(SNOW_DRIFT)
+            else:
+                new_col = col
+            
+            if new_row < 3 and 0 <= new_col < CHAR_LIMIT:
+                new_positions.append((new_row, new_col))
+        
+        if len(new_positions) < 8 and rng.random() > 0.6:
+            new_positions.append((0, rng.randint(0, CHAR_LIMIT-1)))
+        
+        self.snow_positions = new_positions
+        
+        for row, col in self.snow_positions:
+            grid.set(row, col, rng.choice(SNOWFLAKE_CHARS))
+        
+        return grid.to_lines()
+    
+    @animation(preset_id="pulse", name="Pulse", category="Animations", deterministic=True, cycle="pulse")
     def pulse_animation(self):
         try:
-            chars = " ░▒▓█▓▒░ "
-            self.pulse_state = (self.pulse_state + 1) % len(chars)
-            char = chars[self.pulse_state]
-            
-            center = CHAR_LIMIT // 2
-            lines = []
-            
-            for row in range(3):
-                line = ""
-                for col in range(CHAR_LIMIT):
-                    dist = abs(col - center) + abs(row - 1)
-                    if dist <= self.pulse_state % 8:
-                        line += char
-                    else:
-                        line += " "
-                lines.append(line)
-            
-            return lines
+            frames = self.cycle("pulse")
+            self.pulse_state = (self.pulse_state + 1) % len(frames)
+            return frames[self.pulse_state]
         except Exception as e:
             print(f"Pulse animation error: {e}")
             return ["Error", "Pulse Failed", ""]
     
+    def render_pulse_cycle(self, width):
+        chars = " ░▒▓█▓▒░ "
+        center = width // 2
+        frames = []
+        
+        for state, char in enumerate(chars):
+            lines = []
+            for row in range(3):
+                lines.append(''.join(
+                    char if abs(col - center) + abs(row - 1) <= state % 8 else " "
+                    for col in range(width)
+                ))
+            frames.append(lines)
+        
+        return frames
+    
+    @animation(preset_id="sparkle", name="Sparkles", category="Animations", deterministic=True)
     def sparkle_animation(self):
-        grid = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        sparkles = ['·', '•', '*', '✦', '✧', '★']
+        if self.particles is not None:
+            return self.particles.sparkle()
         
-        to_remove = set()
-        for pos in self.sparkle_positions:
-            if random.random() > 0.7:
-                to_remove.add(pos)
-        self.sparkle_positions -= to_remove
+        rng = self.rng("sparkle")
+        grid = self.buffer("sparkle")
+        grid.clear()
         
-        for _ in range(random.randint(0, 3)):
+        self.sparkle_positions.difference_update([pos for pos in self.sparkle_positions if rng.random() > 0.7])
+        
+        for _ in range(rng.randint(0, 3)):
             if len(self.sparkle_positions) < 10:
-                row = random.randint(0, 2)
-                col = random.randint(0, CHAR_LIMIT - 1)
+                row = rng.randint(0, 2)
+                col = rng.randint(0, CHAR_LIMIT - 1)
                 self.sparkle_positions.add((row, col))
         
         for row, col in self.sparkle_positions:
-            grid[row][col] = random.choice(sparkles)
+            grid.set(row, col, rng.choice(SPARKLE_CHARS))
         
-        return [''.join(row) for row in grid]
+        return grid.to_lines()
     
+    @animation(preset_id="rainbow", name="Rainbow", category="Animations", deterministic=True, cycle="rainbow")
     def rainbow_animation(self):
+        frames = self.cycle("rainbow")
+        lines = frames[self.rainbow_offset % len(frames)]
+        self.rainbow_offset += 1
+        return lines
+    
+    def render_rainbow_cycle(self, width):
         colors = "░▒▓█▓▒░"
-        lines = []
+        frames = []
         
-        for row in range(3):
-            line = ""
-            for col in range(CHAR_LIMIT):
-                idx = (col + self.rainbow_offset + row * 2) % len(colors)
-                line += colors[idx]
-            lines.append(line)
+        for offset in range(len(colors)):
+            lines = []
+            for row in range(3):
+                lines.append(''.join(colors[(col + offset + row * 2) % len(colors)] for col in range(width)))
+            frames.append(lines)
         
-        self.rainbow_offset += 1
-        return lines
+        return frames
     
+    @animation(preset_id="fire", name="Fire Effect", category="Animations", deterministic=True, cost=COST_MEDIUM)
     def fire_animation(self):
-        fire_chars = [' ', '·', ':', '▪', '▫', '▬', '▲', '▼']
+        if self.particles is not None:
+            return self.particles.fire()
+        
+        rng = self.rng("fire")
+        heat = self.fire_state
+        top, middle, bottom = 0, CHAR_LIMIT, CHAR_LIMIT * 2
         
         for col in range(CHAR_LIMIT):
-            self.fire_state[2][col] = random.randint(4, 7)
+            heat[bottom + col] = rng.randint(4, 7)
             
             if col > 0 and col < CHAR_LIMIT - 1:
-                avg = (self.fire_state[2][col-1] + self.fire_state[2][col] + self.fire_state[2][col+1]) // 3
-                self.fire_state[1][col] = max(0, avg + random.randint(-2, 1))
+                avg = (heat[bottom + col - 1] + heat[bottom + col] + heat[bottom + col + 1]) // 3
+                heat[middle + col] = max(0, avg + rng.randint(-2, 1))
                 
-                avg = (self.fire_state[1][col-1] + self.fire_state[1][col] + self.fire_state[1][col+1]) // 3
-                self.fire_state[0][col] = max(0, avg + random.randint(-2, 0))
-        
-        lines = []
-        for row in range(3):
-            line = ""
-            for col in range(CHAR_LIMIT):
-                intensity = min(7, self.fire_state[row][col])
-                line += fire_chars[intensity]
-            lines.append(line)
+                avg = (heat[middle + col - 1] + heat[middle + col] + heat[middle + col + 1]) // 3
+                heat[top + col] = max(0, avg + rng.randint(-2, 0))
         
-        return lines
+        grid = self.buffer("fire")
+        grid.fill(heat, FIRE_CHARS)
+        return grid.to_lines()
     
+    @animation(preset_id="wave", name="Ocean Wave", category="Animations", deterministic=True, cycle="wave")
     def wave_animation(self):
-        wave_chars = " ·~≈≋━"
-        lines = []
-        
-        for row in range(3):
-            line = ""
-            for col in range(CHAR_LIMIT):
-                wave_val = abs(int(5 * (0.5 + 0.5 * 
-                    (1 if row == 0 else 0.7 if row == 1 else 0.4) * 
-                    (0.5 + 0.5 * (col / CHAR_LIMIT)) *
-                    (0.5 + 0.5 * abs((self.wave_offset + col * 2) % 20 - 10) / 10))))
-                
-                wave_val = min(len(wave_chars) - 1, wave_val)
-                line += wave_chars[wave_val]
-            lines.append(line)
-        
+        frames = self.cycle("wave")
+        lines = frames[self.wave_offset % len(frames)]
         self.wave_offset += 1
         return lines
     
-    def loading_bar_animation(self):
-        self.loading_pos = (self.loading_pos + 1) % (CHAR_LIMIT * 2)
-        progress = min(CHAR_LIMIT, self.loading_pos)
-        
-        bar = ""
-        for i in range(CHAR_LIMIT):
-            if i < progress:
-                bar += "█"
-            elif i == progress:
-                bar += "▓"
-            else:
-                bar += "░"
+    def render_wave_cycle(self, width):
+        wave_chars = " ·~≈≋━"
+        frames = []
         
-        percent = int((progress / CHAR_LIMIT) * 100)
+        for offset in range(20):
+            lines = []
+            for row in range(3):
+                line = ""
+                for col in range(width):
+                    wave_val = abs(int(5 * (0.5 + 0.5 * 
+                        (1 if row == 0 else 0.7 if row == 1 else 0.4) * 
+                        (0.5 + 0.5 * (col / width)) *
+                        (0.5 + 0.5 * abs((offset + col * 2) % 20 - 10) / 10))))
+                    
+                    wave_val = min(len(wave_chars) - 1, wave_val)
+                    line += wave_chars[wave_val]
+                lines.append(line)
+            frames.append(lines)
         
-        percent_str = f"{percent}%"
-        padding = (CHAR_LIMIT - len(percent_str)) // 2
-        percent_line = "█" * padding + percent_str + "█" * (CHAR_LIMIT - padding - len(percent_str))
+        return frames
+    
+    @animation(preset_id="loading", name="Loading Bar", category="Gaming", deterministic=True, cycle="loading")
+    def loading_bar_animation(self):
+        frames = self.cycle("loading")
+        self.loading_pos = (self.loading_pos + 1) % len(frames)
+        return frames[self.loading_pos]
+    
+    def render_loading_cycle(self, width):
+        frames = []
+        
+        for pos in range(width * 2):
+            progress = min(width, pos)
+            bar = "█" * progress
+            if progress < width:
+                bar += "▓" + "░" * (width - progress - 1)
+            
+            percent = int((progress / width) * 100)
+            
+            percent_str = f"{percent}%"
+            padding = (width - len(percent_str)) // 2
+            percent_line = "█" * padding + percent_str + "█" * (width - padding - len(percent_str))
+            
+            frames.append([
+                "██LOADING...█",
+                bar,
+                percent_line[:width]
+            ])
         
-        return [
-            "██LOADING...█",
-            bar,
-            percent_line[:CHAR_LIMIT]
-        ]
+        return frames
     
+    @animation(preset_id="glitch", name="Glitch Matrix", category="Animations", deterministic=True)
     def glitch_animation(self):
+        rng = self.rng("glitch")
         glitch_chars = "01!@#$%^&*()<>?"
         self.glitch_counter += 1
         
-        lines = []
+        grid = self.buffer("glitch")
         for row in range(3):
-            line = ""
             for col in range(CHAR_LIMIT):
-                if random.random() > 0.3:
+                if rng.random() > 0.3:
                     if (self.glitch_counter + col + row * 5) % 10 < 3:
-                        line += random.choice("01")
+                        grid.set(row, col, rng.choice("01"))
                     else:
-                        line += " "
+                        grid.set(row, col, " ")
                 else:
-                    line += random.choice(glitch_chars)
-            lines.append(line)
+                    grid.set(row, col, rng.choice(glitch_chars))
         
-        return lines
+        return grid.to_lines()
     
+    @animation(preset_id="radar", name="Radar Sweep", category="Gaming", deterministic=True, cycle="radar")
     def radar_animation(self):
+        frames = self.cycle("radar")
         self.radar_angle = (self.radar_angle + 15) % 360
-        center_x = CHAR_LIMIT // 2
+        return frames[self.radar_angle // 15]
+    
+    def render_radar_cycle(self, width):
+        center_x = width // 2
         center_y = 1
+        trail_chars = "█▓▒░"
         
-        grid = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        
+        ring_mask = [[' ' for _ in range(width)] for _ in range(3)]
         for row in range(3):
-            for col in range(CHAR_LIMIT):
+            for col in range(width):
                 dist = ((col - center_x) ** 2 + (row - center_y) ** 2) ** 0.5
-                
-                if 2.5 < dist < 3.5 or 5.5 < dist < 6.5:
-                    grid[row][col] = '·'
-                
-                import math
-                angle_rad = math.radians(self.radar_angle)
-                sweep_x = int(center_x + 5 * math.cos(angle_rad))
-                sweep_y = int(center_y + 2 * math.sin(angle_rad))
-                
-                if 0 <= sweep_y < 3 and 0 <= sweep_x < CHAR_LIMIT:
-                    grid[sweep_y][sweep_x] = '█'
-        
-        if 0 <= center_y < 3 and 0 <= center_x < CHAR_LIMIT:
-            grid[center_y][center_x] = '●'
+                for ring in range(1, self.radar_rings + 1):
+                    if abs(dist - ring * 3) < 0.5:
+                        ring_mask[row][col] = '·'
+        
+        sweep = []
+        for angle in range(0, 360, 15):
+            angle_rad = math.radians(angle)
+            sweep.append((
+                int(center_y + 2 * math.sin(angle_rad)),
+                int(center_x + 5 * math.cos(angle_rad))
+            ))
+        
+        frames = []
+        for step in range(len(sweep)):
+            grid = [list(row) for row in ring_mask]
+            
+            # Oldest trail cell first so the sweep head always wins
+            for age in reversed(range(self.radar_trail)):
+                sweep_y, sweep_x = sweep[(step - age) % len(sweep)]
+                if 0 <= sweep_y < 3 and 0 <= sweep_x < width:
+                    grid[sweep_y][sweep_x] = trail_chars[min(age, len(trail_chars) - 1)]
+            
+            if 0 <= center_y < 3 and 0 <= center_x < width:
+                grid[center_y][center_x] = '●'
+            
+            frames.append([''.join(row) for row in grid])
         
-        return [''.join(row) for row in grid]
+        return frames
     
+    @animation(deterministic=True)
     def typing_animation(self):
+        rng = self.rng("typing")
         self.typing_pos += 1
         
         if self.typing_pos > len(self.current_typing_msg) + 10:
             self.typing_pos = 0
-            self.current_typing_msg = random.choice(self.typing_messages)
+            self.current_typing_msg = rng.choice(self.typing_messages)
         
         displayed = self.current_typing_msg[:self.typing_pos]
         cursor = "█" if self.typing_pos % 2 == 0 else "_"
@@ -566,24 +641,26 @@ class AnimationFunctions:
             "█████████████"
         ]
     
+    @animation(preset_id="binary", name="Binary Stream", category="Animations", deterministic=True)
     def binary_stream_animation(self):
+        rng = self.rng("binary")
         self.binary_offset += 1
-        lines = []
+        grid = self.buffer("binary")
         
         for row in range(3):
-            line = ""
             for col in range(CHAR_LIMIT):
                 pos = (col + self.binary_offset + row * 3) % 8
                 if pos < 4:
-                    line += random.choice("01")
+                    grid.set(row, col, rng.choice("01"))
                 else:
-                    line += " "
-            lines.append(line)
+                    grid.set(row, col, " ")
         
-        return lines
+        return grid.to_lines()
     
+    @animation(preset_id="snake", name="Snake Game", category="Gaming", deterministic=True)
     def snake_game_animation(self):
-        grid = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
+        grid = self.buffer("snake")
+        grid.clear()
         
         head_row, head_col = self.snake_segments[0]
         new_col = head_col + self.snake_direction
@@ -598,69 +675,17 @@ class AnimationFunctions:
             self.snake_segments.pop()
         
         for i, (row, col) in enumerate(self.snake_segments):
-            if 0 <= row < 3 and 0 <= col < CHAR_LIMIT:
-                if i == 0:
-                    grid[row][col] = '●'
-                else:
-                    grid[row][col] = '○'
+            grid.set(row, col, '●' if i == 0 else '○')
         
-        return [''.join(row) for row in grid]
-    
-    def regular_rain_animation(self):
-        rain_chars = ['|', '¦', '┆', '┊', '╎', '╏']
-        
-        for col in range(CHAR_LIMIT):
-            if self.rain_drops[col] > 0:
-                if self.rain_drops[col] <= 3:
-                    row = self.rain_drops[col] - 1
-                    self.regular_rain[row][col] = random.choice(rain_chars)
-                
-                if self.rain_drops[col] > 1 and self.rain_drops[col] <= 4:
-                    prev_row = self.rain_drops[col] - 2
-                    if prev_row >= 0:
-                        self.regular_rain[prev_row][col] = ' '
-                
-                self.rain_drops[col] += 1
-                
-                if self.rain_drops[col] > 6:
-                    self.rain_drops[col] = 0
-                    for row in range(3):
-                        self.regular_rain[row][col] = ' '
-            else:
-                if random.random() > 0.8:
-                    self.rain_drops[col] = 1
-        
-        return [''.join(row) for row in self.regular_rain]
-    
-    def snowflake_animation(self):
-        grid = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        snowflakes = ['❄', '❅', '❆', '*', '·', '◦']
-        
-        self.snow_counter += 1
-        
-        new_positions = []
-        for row, col in self.snow_positions:
-            new_row = row + 1
-            if self.snow_counter % 2 == 0:
-                new_col = col + random.choice([-1, 0, 1])
-            else:
-                new_col = col
-            
-            if new_row < 3 and 0 <= new_col < CHAR_LIMIT:
-                new_positions.append((new_row, new_col))
-        
-        if len(new_positions) < 8 and random.random() > 0.6:
-            new_positions.append((0, random.randint(0, CHAR_LIMIT-1)))
-        
-        self.snow_positions = new_positions
-        
-        for row, col in self.snow_positions:
-            if 0 <= row < 3 and 0 <= col < CHAR_LIMIT:
-                grid[row][col] = random.choice(snowflakes)
-        
-        return [''.join(row) for row in grid]
+        return grid.to_lines()
     
+    @animation(preset_id="anime_faces", name="Anime Faces", category="Anime", deterministic=True, cycle="anime_faces")
     def anime_faces_animation(self):
+        frames = self.cycle("anime_faces")
+        self.anime_face = (self.anime_face + 1) % len(frames)
+        return frames[self.anime_face]
+    
+    def render_anime_faces_cycle(self, width):
         faces = [
             ["  ◕ ‿ ◕    ", "    ___    ", "   \\___/   "],
             ["  ^ _ ^    ", "    ___    ", "   \\___/   "],
@@ -674,21 +699,23 @@ class AnimationFunctions:
             ["  ◉ _ ◉    ", "    ___    ", "   \\___/   "],
         ]
         
-        self.anime_face = (self.anime_face + 1) % (len(faces) * 15)
-        face_index = self.anime_face // 15
-        
-        return faces[face_index]
+        return [face for face in faces for _ in range(15)]
     
+    @animation(preset_id="anime_sparkle", name="Anime Sparkles", category="Anime", deterministic=True)
     def anime_sparkle_animation(self):
-        grid = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        sparkles = ['✧', '✦', '✩', '✪', '⋆', '｡', '°', '∘']
+        if self.particles is not None:
+            return self.particles.anime_sparkle()
         
-        if len(self.anime_sparkle_pos) < 6 and random.random() > 0.7:
+        rng = self.rng("anime_sparkle")
+        grid = self.buffer("anime_sparkle")
+        grid.clear()
+        
+        if len(self.anime_sparkle_pos) < 6 and rng.random() > 0.7:
             self.anime_sparkle_pos.append({
-                'row': random.randint(0, 2),
-                'col': random.randint(0, CHAR_LIMIT-1),
+                'row': rng.randint(0, 2),
+                'col': rng.randint(0, CHAR_LIMIT-1),
                 'life': 0,
-                'char': random.choice(sparkles)
+                'char': rng.choice(ANIME_SPARKLE_CHARS)
             })
         
         new_sparkles = []
@@ -696,19 +723,23 @@ class AnimationFunctions:
             sparkle['life'] += 1
             if sparkle['life'] < 15:
                 if sparkle['life'] % 3 == 0:
-                    sparkle['char'] = random.choice(sparkles)
+                    sparkle['char'] = rng.choice(ANIME_SPARKLE_CHARS)
                 
-                row, col = sparkle['row'], sparkle['col']
-                if 0 <= row < 3 and 0 <= col < CHAR_LIMIT:
-                    grid[row][col] = sparkle['char']
+                grid.set(sparkle['row'], sparkle['col'], sparkle['char'])
                 
                 new_sparkles.append(sparkle)
         
         self.anime_sparkle_pos = new_sparkles
         
-        return [''.join(row) for row in grid]
+        return grid.to_lines()
     
+    @animation(preset_id="cat_standing", name="Standing Cat", category="Anime", deterministic=True, cycle="cat_standing")
     def cat_standing_animation(self):
+        frames = self.cycle("cat_standing")
+        self.cat_walk_frame = (self.cat_walk_frame + 1) % len(frames)
+        return frames[self.cat_walk_frame]
+    
+    def render_cat_standing_cycle(self, width):
         frames = [
             ["    /\\_/\\    ", "   ( o.o )   ", "    > ^ <    "],
             ["    /\\_/\\    ", "   ( o.o )   ", "    > ~ <    "],
@@ -716,37 +747,25 @@ class AnimationFunctions:
             ["    /\\_/\\    ", "   ( o.o )   ", "    > ~ <    "],
         ]
         
-        self.cat_walk_frame = (self.cat_walk_frame + 1) % (len(frames) * 10)
-        frame_index = self.cat_walk_frame // 10
-        
-        return frames[frame_index]
+        return [frame for frame in frames for _ in range(10)]
     
+    @animation(preset_id="cat_walking", name="Walking Cat", category="Anime", deterministic=True)
     def cat_walking_animation(self):
         self.cat_walk_frame = (self.cat_walk_frame + 1) % 4
         self.cat_position = (self.cat_position + 1) % (CHAR_LIMIT + 10)
         
-        grid = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        
-        cat_frames = [
-            ["∧_∧", "(='.'=)", "(¨)_(¨)"],
-            ["∧_∧", "(='.'=)", "(_¨)(¨)"],
-            ["∧_∧", "(='.'=)", "(¨)_(¨)"],
-            ["∧_∧", "(='.'=)", "(¨)(_¨)"],
-        ]
+        grid = self.buffer("cat_walking")
+        grid.clear()
         
-        current_frame = cat_frames[self.cat_walk_frame]
+        current_frame = CAT_WALK_FRAMES[self.cat_walk_frame]
         
         for row in range(3):
             cat_line = current_frame[row]
-            start_pos = self.cat_position - len(cat_line)
-            
-            for i, char in enumerate(cat_line):
-                pos = start_pos + i
-                if 0 <= pos < CHAR_LIMIT:
-                    grid[row][pos] = char
+            grid.blit(row, self.cat_position - len(cat_line), cat_line)
         
-        return [''.join(row) for row in grid]
+        return grid.to_lines()
     
+    @animation(preset_id="mouse_running", name="Running Mouse", category="Anime", deterministic=True)
     def mouse_running_animation(self):
         self.mouse_frame = (self.mouse_frame + 1) % 3
         self.mouse_position += 2
@@ -754,25 +773,22 @@ class AnimationFunctions:
         if self.mouse_position > CHAR_LIMIT + 5:
             self.mouse_position = -10
         
-        grid = [[' ' for _ in range(CHAR_LIMIT)] for _ in range(3)]
-        
-        mouse_frames = [
-            ["", "ᘛ⁐ᕐᐷ...", ""],
-            ["", ".ᘛ⁐ᕐᐷ..", ""],
-            ["", "..ᘛ⁐ᕐᐷ.", ""],
-        ]
+        grid = self.buffer("mouse_running")
+        grid.clear()
         
-        mouse = mouse_frames[self.mouse_frame]
-        for row in range(3):
-            if mouse[row]:
-                for i, char in enumerate(mouse[row]):
-                    pos = self.mouse_position + i
-                    if 0 <= pos < CHAR_LIMIT:
-                        grid[row][pos] = char
+        grid.draw_sprite(0, self.mouse_position, MOUSE_FRAMES[self.mouse_frame])
         
         for i in range(3):
-            trail_pos = self.mouse_position - i - 1
-            if 0 <= trail_pos < CHAR_LIMIT:
-                grid[1][trail_pos] = '-'
+            grid.set(1, self.mouse_position - i - 1, '-')
         
-        return [''.join(row) for row in grid]
\ No newline at end of file
+        return grid.to_lines()
+
+composite("rain_clock", "Rain + Clock", [
+    {"func": "japanese_rain_animation"},
+    {"func": "show_clock", "rows": [1], "source_rows": [0], "align": "center"},
+])
+
+composite("cat_cpu", "Cat + CPU", [
+    {"func": "cat_walking_animation", "rows": [0, 1]},
+    {"func": "show_cpu_graph", "rows": [2], "source_rows": [0]},
+])
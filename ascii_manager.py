@@ -1,6 +1,7 @@
 import os
 import glob
 from config import ASCII_DIR, CHAR_LIMIT
+from registry import presets_by_category
 
 class ASCIIArtManager:
     def __init__(self):
@@ -126,6 +127,8 @@ class ASCIIArtManager:
             
         for filename, lines in arts.items():
             filepath = os.path.join(self.ascii_dir, filename)
+            if os.path.exists(filepath):
+                continue
             
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write('\n'.join(lines))
@@ -157,39 +160,11 @@ class ASCIIArtManager:
 
 class PresetManager:
     @staticmethod
-    def get_all_presets(ascii_arts):
-        presets = {
-            "Animations": {
-                "japanese_rain": {"name": "Matrix Rain", "type": "animation", "func": "japanese_rain_animation"},
-                "regular_rain": {"name": "Rain", "type": "animation", "func": "regular_rain_animation"},
-                "snowflake": {"name": "Snowflakes", "type": "animation", "func": "snowflake_animation"},
-                "pulse": {"name": "Pulse", "type": "animation", "func": "pulse_animation"},
-                "sparkle": {"name": "Sparkles", "type": "animation", "func": "sparkle_animation"},
-                "rainbow": {"name": "Rainbow", "type": "animation", "func": "rainbow_animation"},
-                "fire": {"name": "Fire Effect", "type": "animation", "func": "fire_animation"},
-                "wave": {"name": "Ocean Wave", "type": "animation", "func": "wave_animation"},
-                "glitch": {"name": "Glitch Matrix", "type": "animation", "func": "glitch_animation"},
-                "binary": {"name": "Binary Stream", "type": "animation", "func": "binary_stream_animation"},
-            },
-            "Gaming": {
-                "loading": {"name": "Loading Bar", "type": "animation", "func": "loading_bar_animation"},
-                "radar": {"name": "Radar Sweep", "type": "animation", "func": "radar_animation"},
-                "snake": {"name": "Snake Game", "type": "animation", "func": "snake_game_animation"},
-            },
-            "Anime": {
-                "anime_faces": {"name": "Anime Faces", "type": "animation", "func": "anime_faces_animation"},
-                "anime_sparkle": {"name": "Anime Sparkles", "type": "animation", "func": "anime_sparkle_animation"},
-                "cat_standing": {"name": "Standing Cat", "type": "animation", "func": "cat_standing_animation"},
-                "cat_walking": {"name": "Walking Cat", "type": "animation", "func": "cat_walking_animation"},
-                "mouse_running": {"name": "Running Mouse", "type": "animation", "func": "mouse_running_animation"},
-            },
-            "System": {
-                "clock": {"name": "Clock", "type": "dynamic", "func": "show_clock"},
-                "gpu_cpu_ram": {"name": "GPU, CPU & RAM", "type": "dynamic", "func": "show_gpu_cpu_ram"},
-                "ram_net_uptime": {"name": "RAM, NETWORK & UPTIME", "type": "dynamic", "func": "show_ram_network_uptime"},
-                "temperatures": {"name": "Temperatures", "type": "dynamic", "func": "show_temperatures"},
-            },
-            "ASCII Art": ascii_arts
-        }
+    def get_all_presets(ascii_arts, clips=None):
+        presets = presets_by_category()
+        presets["ASCII Art"] = ascii_arts
+        
+        if clips:
+            presets["Clips"] = clips
         
         return presets
\ No newline at end of file
@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import psutil
+from sensors import CpuSampler
+
+# Call cost of one CPU utilisation reading:
+#   before - psutil.cpu_percent(interval=...), which sleeps for the interval on the caller's thread
+#   after  - CpuSampler.sample(), a delta against the previous cpu_times snapshot
+
+def time_calls(func, calls):
+    costs = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        func()
+        costs.append(time.perf_counter() - started)
+    costs.sort()
+    return costs[len(costs) // 2], costs[-1]
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark blocking vs delta-based CPU sampling")
+    parser.add_argument("--calls", type=int, default=5000, help="Calls for the non-blocking sampler")
+    parser.add_argument("--blocking-calls", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rows = [
+        # show_gpu_cpu_ram and show_cpu_graph used these intervals
+        ("cpu_percent(interval=0.1)", lambda: psutil.cpu_percent(interval=0.1), args.blocking_calls),
+        ("cpu_percent(interval=0.5, percpu)", lambda: psutil.cpu_percent(interval=0.5, percpu=True), args.blocking_calls),
+    ]
+    sampler = CpuSampler()
+    sampler.sample()
+    rows.append(("CpuSampler.sample()", sampler.sample, args.calls))
+
+    print(f"{psutil.cpu_count()} logical CPUs")
+    print(f"{'':36s}{'calls':>7s}{'median':>12s}{'max':>12s}")
+    for name, func, calls in rows:
+        median, worst = time_calls(func, calls)
+        print(f"{name:36s}{calls:7d}{median * 1000:10.3f}ms{worst * 1000:10.3f}ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
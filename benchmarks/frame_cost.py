@@ -0,0 +1,80 @@
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ANIMATIONS = [
+    "rainbow_animation", "pulse_animation", "wave_animation", "loading_bar_animation",
+    "radar_animation", "anime_faces_animation", "cat_standing_animation",
+]
+
+# Per-frame cost of the cyclic animations in this tree against a baseline revision,
+# by default the tree just before frame_cache.py was added (frames rebuilt every tick)
+
+TIMER = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from animations import AnimationFunctions
+animations = AnimationFunctions()
+frames = int(sys.argv[2])
+results = {}
+for name in sys.argv[3].split(","):
+    func = getattr(animations, name)
+    func()  # first call fills the cycle cache where there is one
+    costs = []
+    for _ in range(frames):
+        started = time.perf_counter()
+        func()
+        costs.append(time.perf_counter() - started)
+    costs.sort()
+    results[name] = costs[len(costs) // 2]
+print(json.dumps(results))
+"""
+
+def git(*args):
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, check=True).stdout
+
+def default_baseline():
+    added = git("log", "--diff-filter=A", "--format=%H", "--", "frame_cache.py").decode().split()
+    if not added:
+        raise SystemExit("frame_cache.py has no history here, pass --baseline")
+    return added[-1] + "^"
+
+def extract(revision, directory):
+    with tarfile.open(fileobj=io.BytesIO(git("archive", revision)), mode="r:") as archive:
+        if hasattr(tarfile, "data_filter"):
+            archive.extractall(directory, filter="data")
+        else:
+            archive.extractall(directory)
+
+def measure(tree, frames):
+    result = subprocess.run([sys.executable, "-c", TIMER, tree, str(frames), ",".join(ANIMATIONS)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark per-frame cost of the cyclic animations")
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--baseline", default=None, help="Git revision to compare against")
+    args = parser.parse_args(argv)
+
+    baseline = args.baseline or default_baseline()
+    with tempfile.TemporaryDirectory() as directory:
+        extract(baseline, directory)
+        before = measure(directory, args.frames)
+    after = measure(ROOT, args.frames)
+
+    print(f"median per-frame cost over {args.frames} frames, baseline {git('rev-parse', '--short', baseline).decode().strip()}")
+    print(f"{'':26s}{'before':>10s}{'after':>10s}{'speedup':>9s}")
+    for name in ANIMATIONS:
+        print(f"{name:26s}{before[name] * 1e6:8.2f}us{after[name] * 1e6:8.2f}us{before[name] / after[name]:8.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
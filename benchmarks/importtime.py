@@ -0,0 +1,50 @@
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["animations", "player", "plugins", "daemon"]
+FORBIDDEN = ["tkinter", "customtkinter", "requests", "psutil", "pynvml", "wmi"]
+
+def measure():
+    # -X importtime reports "self | cumulative | name" in microseconds, nesting shown by indent
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(MODULES)}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        imported.add(name.strip())
+        if name.strip() in MODULES and name == " " + name.strip():
+            total += int(parts[1])
+    return total / 1000.0, imported
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the non-GUI modules")
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    measure()  # warm the bytecode and filesystem caches
+    runs = [measure() for _ in range(args.runs)]
+    best = min(ms for ms, _ in runs)
+    leaked = sorted(name for name in FORBIDDEN if name in runs[0][1])
+
+    print(f"import {', '.join(MODULES)}: best {best:.1f} ms of {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if leaked:
+        print(f"Imported eagerly: {', '.join(leaked)}")
+    return 0 if best <= args.budget_ms and not leaked else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "tests")]
+
+import requests
+from controller import OLEDController
+from gamesense import GameSenseStub
+
+# Frames/sec and send latency against a local GameSense stub:
+#   before - a fresh requests.post per frame, as OLEDController.display did originally
+#   after  - OLEDController.display on its pooled keep-alive session
+
+def frame(i):
+    # Every frame differs so the controller never skips one as a duplicate
+    return (f"frame {i}", "", "")
+
+def send_fresh(url, i):
+    l1, l2, l3 = frame(i)
+    data = {"game": "BENCH", "event": "DISPLAY", "data": {"value": i % 100, "frame": {"l1": l1, "l2": l2, "l3": l3}}}
+    return requests.post(f"{url}/game_event", json=data, timeout=0.5).status_code == 200
+
+def run(send, frames):
+    latencies = []
+    failures = 0
+    started = time.perf_counter()
+    for i in range(frames):
+        before = time.perf_counter()
+        if not send(i):
+            failures += 1
+        latencies.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "fps": frames / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "failed": failures
+    }
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark frame sends against a local GameSense stub")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial server processing time")
+    args = parser.parse_args(argv)
+
+    stub = GameSenseStub(latency=args.latency_ms / 1000.0).start()
+    try:
+        controller = OLEDController()
+        controller.server_url = stub.url
+        controller.is_connected = True
+
+        results = {}
+        for name, send in (("before", lambda i: send_fresh(stub.url, i)),
+                           ("after", lambda i: controller.display(*frame(i)))):
+            run(send, min(100, args.frames))  # warm up
+            results[name] = run(send, args.frames)
+        controller.reset_session()
+    finally:
+        stub.stop()
+
+    print(f"{args.frames} frames, server latency {args.latency_ms:.1f} ms")
+    print(f"{'':8s}{'frames/s':>10s}{'p50 ms':>10s}{'p99 ms':>10s}{'failed':>8s}")
+    for name, r in results.items():
+        print(f"{name:8s}{r['fps']:10.0f}{r['p50']:10.2f}{r['p99']:10.2f}{r['failed']:8d}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -8,7 +8,8 @@ if exist dist rmdir /s /q dist
 if exist *.spec del *.spec
 
 REM Build executable
-pyinstaller --onefile --windowed --noconsole --name "NovaProXController" --icon="icon.ico" --collect-all customtkinter main.py
+REM requests, psutil, wmi and pythoncom are imported by name through lazy.load, which the analyser cannot follow
+pyinstaller --onefile --windowed --noconsole --name "NovaProXController" --icon="icon.ico" --collect-all customtkinter --hidden-import requests --hidden-import psutil --hidden-import wmi --hidden-import pythoncom --hidden-import pynvml main.py
 
 echo.
 echo Build complete! Check the dist folder for the executable.
@@ -0,0 +1,148 @@
+import glob
+import mmap
+import os
+import struct
+import sys
+import zlib
+from config import CLIPS_DIR, CLIP_EXTENSION, DEFAULT_SPEED_MS
+
+CLIP_MAGIC = b'NCLP'
+CLIP_VERSION = 1
+
+# magic, version, index item size, frame count, dictionary entries, interval ms,
+# dictionary offset, compressed dictionary size
+CLIP_HEADER = struct.Struct('<4sHHIIIII')
+
+def record_clip(func, frame_count, path, interval_ms=DEFAULT_SPEED_MS):
+    dictionary = {}
+    indices = []
+
+    for _ in range(frame_count):
+        lines = list(func())[:3]
+        while len(lines) < 3:
+            lines.append("")
+        for line in lines:
+            indices.append(dictionary.setdefault(str(line), len(dictionary)))
+
+    item_format = 'H' if len(dictionary) <= 0xFFFF else 'I'
+    index_table = struct.pack(f'<{len(indices)}{item_format}', *indices)
+    packed_dictionary = zlib.compress('\0'.join(dictionary).encode('utf-8'), 9)
+
+    dictionary_offset = CLIP_HEADER.size + len(index_table)
+    header = CLIP_HEADER.pack(
+        CLIP_MAGIC,
+        CLIP_VERSION,
+        struct.calcsize(item_format),
+        frame_count,
+        len(dictionary),
+        int(interval_ms),
+        dictionary_offset,
+        len(packed_dictionary)
+    )
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(index_table)
+        f.write(packed_dictionary)
+
+    return {"frames": frame_count, "unique_lines": len(dictionary), "bytes": dictionary_offset + len(packed_dictionary)}
+
+class ClipPlayer:
+    __name__ = 'clip_player'
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, item_size, self.frame_count, entries,
+         self.interval_ms, dictionary_offset, dictionary_size) = CLIP_HEADER.unpack_from(self.mm, 0)
+
+        if magic != CLIP_MAGIC or version != CLIP_VERSION:
+            self.close()
+            raise ValueError(f"Not a clip file: {path}")
+        if self.frame_count == 0:
+            self.close()
+            raise ValueError(f"Empty clip: {path}")
+
+        packed = self.mm[dictionary_offset:dictionary_offset + dictionary_size]
+        self.dictionary = zlib.decompress(packed).decode('utf-8').split('\0')
+        if len(self.dictionary) != entries:
+            self.close()
+            raise ValueError(f"Corrupt clip dictionary: {path}")
+
+        self.frame_format = struct.Struct('<3' + ('H' if item_size == 2 else 'I'))
+        self.position = 0
+
+    def __call__(self):
+        a, b, c = self.frame_format.unpack_from(self.mm, CLIP_HEADER.size + self.position * self.frame_format.size)
+        self.position = (self.position + 1) % self.frame_count
+        dictionary = self.dictionary
+        return [dictionary[a], dictionary[b], dictionary[c]]
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+def load_clip_presets(clips_dir=CLIPS_DIR):
+    clips = {}
+    for filepath in sorted(glob.glob(os.path.join(clips_dir, f"*{CLIP_EXTENSION}"))):
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        clips[f"clip_{name}"] = {
+            "name": name.replace('_', ' ').title(),
+            "type": "clip",
+            "path": filepath
+        }
+    return clips
+
+def main(argv):
+    import argparse
+    from animations import AnimationFunctions
+    from ascii_manager import ASCIIArtManager, PresetManager
+    from player import create_program
+    from plugins import register_plugins
+    from registry import get_spec
+
+    parser = argparse.ArgumentParser(description="Record an animation into a clip file")
+    parser.add_argument("preset", help="Preset id or AnimationFunctions method, e.g. rain_clock or japanese_rain_animation")
+    parser.add_argument("frames", type=int, help="Number of frames to record")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--interval", type=int, default=None,
+                        help="Playback interval in ms, defaults to the preset's own period or the default speed")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+
+    animations = AnimationFunctions(args.seed)
+    register_plugins()
+    presets = PresetManager.get_all_presets(ASCIIArtManager().load_ascii_arts())
+    preset_data = next((category[args.preset] for category in presets.values() if args.preset in category), None)
+    if preset_data is None:
+        spec = get_spec(args.preset)
+        if spec is None:
+            parser.error(f"Unknown preset or animation: {args.preset}")
+        preset_data = spec.preset_data()
+
+    program = create_program(animations, args.preset, preset_data)
+    if not program.spec.deterministic:
+        print(f"Warning: {args.preset} depends on live data, the clip will replay a snapshot")
+
+    interval_ms = args.interval
+    if interval_ms is None:
+        interval_ms = program.spec.period * 1000 if program.spec.period else DEFAULT_SPEED_MS
+
+    out = args.out or os.path.join(CLIPS_DIR, args.preset.replace('_animation', '') + CLIP_EXTENSION)
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+
+    try:
+        stats = record_clip(program.func, args.frames, out, interval_ms)
+    finally:
+        if hasattr(program.func, 'close'):
+            program.func.close()
+    print(f"Recorded {stats['frames']} frames ({stats['unique_lines']} unique lines, {stats['bytes']} bytes) to {out}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,104 @@
+import time
+from config import CHAR_LIMIT
+from framebuffer import FrameBuffer
+from registry import get_spec
+
+class Layer:
+    def __init__(self, func, z=0, period=None, rows=None, source_rows=None, cells=None,
+                 align=None, transparent=' ', width=CHAR_LIMIT, height=3):
+        self.func = func
+        self.z = z
+        self.period = period
+        self.align = align
+        self.transparent = transparent
+        self.width = width
+        self.lines = None
+        self.next_due = 0.0
+
+        rows = list(range(height)) if rows is None else list(rows)
+        source_rows = rows if source_rows is None else list(source_rows)
+
+        # (target row, source row, visible columns), resolved once so compositing is a plain copy
+        self.plan = []
+        for target, source in zip(rows, source_rows):
+            if cells is None:
+                columns = range(width)
+            else:
+                mask = cells[target] if target < len(cells) else ""
+                columns = [col for col in range(min(width, len(mask))) if mask[col] != ' ']
+            self.plan.append((target, source, tuple(columns)))
+
+    def due(self, now):
+        return self.period is None or now >= self.next_due
+
+    def update(self, now):
+        if self.period is not None:
+            next_due = self.next_due + self.period
+            # First update or a stall: restart the cadence from now instead of catching up
+            self.next_due = next_due if next_due > now else now + self.period
+
+        lines = self.func()
+        if not lines or len(lines) != 3:
+            return False
+
+        lines = [str(line) for line in lines]
+        if self.align == "center":
+            lines = [line.strip().center(self.width) for line in lines]
+
+        if lines == self.lines:
+            return False
+        self.lines = lines
+        return True
+
+    def draw(self, frame):
+        lines = self.lines
+        if lines is None:
+            return
+
+        transparent = self.transparent
+        for target, source, columns in self.plan:
+            line = lines[source]
+            for col in columns:
+                if col < len(line) and line[col] != transparent:
+                    frame.set(target, col, line[col])
+
+    def close(self):
+        if hasattr(self.func, 'close'):
+            self.func.close()
+
+class Compositor:
+    __name__ = 'compositor'
+
+    def __init__(self, layers, width=CHAR_LIMIT, height=3):
+        self.layers = sorted(layers, key=lambda layer: layer.z)
+        self.frame = FrameBuffer(width, height)
+        self.renders = 0
+
+    def __call__(self):
+        now = time.monotonic()
+        changed = False
+        for layer in self.layers:
+            if layer.due(now) and layer.update(now):
+                changed = True
+
+        if changed:
+            self.frame.clear()
+            for layer in self.layers:
+                layer.draw(self.frame)
+            self.renders += 1
+
+        return self.frame.to_lines()
+
+    def close(self):
+        for layer in self.layers:
+            layer.close()
+
+def create_composite(spec, resolve):
+    layers = []
+    for z, options in enumerate(spec.layers):
+        options = dict(options)
+        layer_spec = get_spec(options.pop("func"))
+        options.setdefault("z", z)
+        options.setdefault("period", layer_spec.period)
+        layers.append(Layer(resolve(layer_spec), **options))
+    return Compositor(layers)
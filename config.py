@@ -8,6 +8,21 @@ DEVELOPER = "Zimcim"
 DEFAULT_SPEED_MS = 100
 MIN_SPEED_MS = 10
 MAX_SPEED_MS = 500
+FRAME_STATS_WINDOW = 50
+PREVIEW_REFRESH_HZ = 60
+RADAR_RINGS = 2
+RADAR_TRAIL = 1
+PARTICLE_ENGINE = "auto"
+NUMPY_MIN_CELLS = 512
+PLAYLIST_ITEM_S = 30
+PLAYLIST_PREWARM_S = 1.0
+PLAYLIST_TRANSITION = "wipe"
+TRANSITION_FRAMES = 8
+SENSOR_STALE_S = 5
+CPU_SMOOTHING = 0.5
+GPU_BACKEND = "auto"
+TEMP_MAX_FAILURES = 3
+TEMP_REPROBE_S = 30
 
 WINDOW_WIDTH = 900
 WINDOW_HEIGHT = 700
@@ -20,5 +35,17 @@ BUTTON_COLOR_DEFAULT = ["#3a7ebf", "#1f538d"]
 
 CONFIG_FILE = "nova_settings.ini"
 ASCII_DIR = "ascii_arts"
+CLIPS_DIR = "clips"
+CLIP_EXTENSION = ".nclip"
+PLUGINS_DIR = "plugins"
+PLUGIN_ENTRY_POINT_GROUP = "nova_pro_x.animations"
 
-DEFAULT_SERVER_URL = "http://127.0.0.1:61369"
\ No newline at end of file
+DEFAULT_SERVER_URL = "http://127.0.0.1:61369"
+HTTP_POOL_SIZE = 2
+HEARTBEAT_INTERVAL_S = 10
+SEND_FAILURE_LIMIT = 3
+RECONNECT_MIN_S = 1
+RECONNECT_MAX_S = 30
+CORE_PROPS_POLL_S = 2
+CONTROL_HOST = "127.0.0.1"
+CONTROL_PORT = 61370
\ No newline at end of file
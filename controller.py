@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+import time
+from lazy import load
+from config import (GAME_NAME, GAME_DISPLAY_NAME, DEVELOPER, CHAR_LIMIT, BLANK_SPACE_CHAR,
+                    DEFAULT_SERVER_URL, HTTP_POOL_SIZE, HEARTBEAT_INTERVAL_S)
+
+# display() result for a frame skipped as a duplicate of the one already on screen
+UNCHANGED = "unchanged"
+
+def core_props_path():
+    if os.name == 'nt':
+        return os.path.join(os.environ.get('PROGRAMDATA', 'C:\\ProgramData'), 
+                            'SteelSeries', 'SteelSeries Engine 3', 'coreProps.json')
+    return os.path.expanduser('~/Library/Application Support/SteelSeries Engine 3/coreProps.json')
+
+def read_server_url(config_path):
+    # None while the file is missing or half written, callers keep their current address
+    try:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+            return f"http://{config['address']}"
+    except:
+        return None
+
+def get_server_url(config_path=None):
+    return read_server_url(config_path or core_props_path()) or DEFAULT_SERVER_URL
+
+class OLEDController:
+    def __init__(self):
+        self.server_url = get_server_url()
+        self.game_name = GAME_NAME
+        self.current_value = 0
+        self.is_connected = False
+        self.session = None
+        self.session_lock = threading.Lock()
+        self.heartbeat_interval = HEARTBEAT_INTERVAL_S
+        self.last_frame = None
+        self.last_sent_time = 0
+        self.suppressed_count = 0
+    
+    def get_session(self):
+        with self.session_lock:
+            if self.session is None:
+                requests = load("requests")
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=0
+                )
+                session.mount("http://", adapter)
+                self.session = session
+            return self.session
+    
+    def set_server_url(self, url):
+        if url == self.server_url:
+            return False
+        
+        self.server_url = url
+        self.reset_session()
+        return True
+    
+    def reset_session(self):
+        with self.session_lock:
+            session = self.session
+            self.session = None
+        
+        if session is not None:
+            try:
+                session.close()
+            except:
+                pass
+    
+    def post(self, path, payload, timeout):
+        # Keep-alive: reuse pooled connections, reconnect once if the server dropped ours
+        requests = load("requests")
+        url = f"{self.server_url}{path}"
+        for attempt in range(2):
+            session = self.get_session()
+            try:
+                return session.post(url, json=payload, timeout=timeout)
+            except requests.Timeout:
+                self.reset_session()
+                raise
+            except requests.ConnectionError:
+                self.reset_session()
+                if attempt:
+                    raise
+        
+    def setup(self):
+        self.is_connected = False
+        self.last_frame = None
+        try:
+            self.post("/remove_game", {"game": self.game_name}, timeout=2)
+            time.sleep(0.2)
+            
+            metadata = {
+                "game": self.game_name,
+                "game_display_name": GAME_DISPLAY_NAME,
+                "developer": DEVELOPER
+            }
+            self.post("/game_metadata", metadata, timeout=2)
+            
+            bind_data = {
+                "game": self.game_name,
+                "event": "DISPLAY",
+                "handlers": [{
+                    "device-type": "screened",
+                    "zone": "one",
+                    "mode": "screen",
+                    "datas": [{
+                        "lines": [
+                            {"has-text": True, "context-frame-key": "l1"},
+                            {"has-text": True, "context-frame-key": "l2"},
+                            {"has-text": True, "context-frame-key": "l3"}
+                        ]
+                    }]
+                }]
+            }
+            response = self.post("/bind_game_event", bind_data, timeout=2)
+            self.is_connected = response.status_code == 200
+            return self.is_connected
+        except:
+            self.is_connected = False
+            return False
+    
+    def display(self, line1="", line2="", line3=""):
+        if not self.is_connected:
+            return False
+        
+        line1_display = str(line1).replace(' ', BLANK_SPACE_CHAR)
+        line2_display = str(line2).replace(' ', BLANK_SPACE_CHAR)
+        line3_display = str(line3).replace(' ', BLANK_SPACE_CHAR)
+        
+        frame = {
+            "l1": line1_display[:CHAR_LIMIT],
+            "l2": line2_display[:CHAR_LIMIT],
+            "l3": line3_display[:CHAR_LIMIT]
+        }
+        
+        # Unchanged frame: skip the request until the heartbeat keeps GameSense from timing out
+        now = time.monotonic()
+        if frame == self.last_frame and now - self.last_sent_time < self.heartbeat_interval:
+            self.suppressed_count += 1
+            return UNCHANGED
+        
+        self.current_value = (self.current_value + 1) % 100
+        
+        data = {
+            "game": self.game_name,
+            "event": "DISPLAY",
+            "data": {
+                "value": self.current_value,
+                "frame": frame
+            }
+        }
+        
+        try:
+            response = self.post("/game_event", data, timeout=0.5)
+            if response.status_code == 200:
+                self.last_frame = frame
+                self.last_sent_time = now
+                return True
+            return False
+        except Exception as e:
+            return False
+    
+    def cleanup(self):
+        try:
+            for _ in range(3):
+                self.display("", "", "")
+                time.sleep(0.01)
+            self.post("/remove_game", {"game": self.game_name}, timeout=1)
+        except:
+            pass
+        self.reset_session()
@@ -0,0 +1,280 @@
+import argparse
+import configparser
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from config import *
+from controller import OLEDController
+from animations import AnimationFunctions
+from registry import CUSTOM_SPEC
+from plugins import register_plugins
+from frame_sender import FrameSender
+from supervisor import ConnectionSupervisor
+from player import Player, Playlist, create_program, static_program, parse_playlist
+from random_streams import new_seed
+from ascii_manager import ASCIIArtManager, PresetManager
+from clips import load_clip_presets
+
+# Headless front end: same player, sender and controller as the GUI, no Tk imports
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode('utf-8', 'replace').strip()
+            if not line:
+                continue
+            reply = self.server.nova.handle_command(line)
+            self.wfile.write((reply + "\n").encode('utf-8'))
+
+class ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class NovaDaemon:
+    def __init__(self, config_file=CONFIG_FILE):
+        self.config = configparser.ConfigParser()
+        self.config_file = config_file
+        if os.path.exists(config_file):
+            self.config.read(config_file)
+
+        self.controller = OLEDController()
+        self.supervisor = ConnectionSupervisor(self.controller, self.on_connection_change)
+        self.sender = FrameSender(self.controller, self.supervisor.report)
+        self.animations = AnimationFunctions()
+
+        ranking = self.config.get('Diagnostics', 'temperature_sources', fallback='')
+        if ranking:
+            self.animations.temperature.set_order(ranking.split(','))
+
+        plugin_count = register_plugins()
+        if plugin_count:
+            print(f"Registered {plugin_count} plugin presets")
+
+        ascii_arts = ASCIIArtManager().load_ascii_arts()
+        self.all_presets = PresetManager.get_all_presets(ascii_arts, load_clip_presets())
+
+        self.player = Player(self.animations.sensors, self.output_frame, self.build_program)
+        self.player.set_speed(self.config.getfloat('Settings', 'speed', fallback=DEFAULT_SPEED_MS))
+        self.current_preset = None
+        self.stopped = threading.Event()
+        self.server = None
+
+    def output_frame(self, lines):
+        self.sender.submit(*lines)
+
+    def find_preset(self, preset_id):
+        for category, presets in self.all_presets.items():
+            if preset_id in presets:
+                return presets[preset_id]
+        return None
+
+    def build_program(self, preset_id):
+        preset_data = self.find_preset(preset_id)
+        if preset_data is None:
+            raise ValueError(f"Unknown preset: {preset_id}")
+        return create_program(self.animations, preset_id, preset_data)
+
+    def play_preset(self, preset_id, seed=None):
+        preset_data = self.find_preset(preset_id)
+        if preset_data is None:
+            raise ValueError(f"Unknown preset: {preset_id}")
+
+        if seed is None:
+            seed = int(preset_data["seed"]) if "seed" in preset_data else new_seed()
+
+        def start():
+            self.animations.reseed(seed)
+            return create_program(self.animations, preset_id, preset_data)
+
+        self.player.play(start)
+        self.current_preset = preset_id
+        print(f"Playing {preset_id} (seed {seed})")
+
+    def play_custom(self, lines):
+        lines = [line[:CHAR_LIMIT] for line in (list(lines) + ["", "", ""])[:3]]
+        self.player.play(lambda: static_program("custom_text", lines, CUSTOM_SPEC))
+        self.current_preset = "custom_text"
+
+    def play_playlist(self, text=None, transition=None):
+        items = parse_playlist(text if text is not None else self.config.get('Playlist', 'items', fallback=''))
+        if not items:
+            raise ValueError("Empty playlist")
+
+        if transition is None:
+            transition = self.config.get('Playlist', 'transition', fallback=PLAYLIST_TRANSITION)
+        self.player.play_playlist(Playlist(items, transition))
+        self.current_preset = "playlist"
+        print(f"Playing playlist of {len(items)} presets")
+
+    def play_last(self):
+        last_preset = self.config.get('Settings', 'last_preset', fallback='')
+        if last_preset == "custom_text":
+            self.play_custom([self.config.get('Settings', f'custom_line_{i+1}', fallback='') for i in range(3)])
+        elif last_preset == "playlist":
+            self.play_playlist()
+        elif last_preset:
+            self.play_preset(last_preset)
+        else:
+            print("No preset given and no last preset in settings, idling")
+
+    def stop_preset(self):
+        self.player.play(None)
+        self.current_preset = None
+
+    def on_connection_change(self, connected):
+        if connected:
+            print(f"Connected to {self.controller.server_url}")
+        else:
+            print(f"Not connected to {self.controller.server_url}, retrying")
+
+    def status(self):
+        return {
+            "preset": self.current_preset,
+            "connected": self.controller.is_connected,
+            "server": self.controller.server_url,
+            "reconnects": self.supervisor.reconnects,
+            "speed_ms": self.player.speed_ms,
+            "frames": self.player.get_stats(),
+            "sender": self.sender.get_stats(),
+            "unchanged": self.controller.suppressed_count
+        }
+
+    def handle_command(self, line):
+        command, _, argument = line.partition(' ')
+        command = command.lower()
+        argument = argument.strip()
+        try:
+            if command == "preset":
+                preset_id, _, seed = argument.partition(' ')
+                self.play_preset(preset_id, int(seed) if seed else None)
+            elif command == "playlist":
+                self.play_playlist(argument or None)
+            elif command == "text":
+                self.play_custom(argument.split('|'))
+            elif command == "speed":
+                self.player.set_speed(float(argument))
+            elif command == "stop":
+                self.stop_preset()
+            elif command == "reconnect":
+                self.supervisor.request_reconnect()
+            elif command == "status":
+                return json.dumps(self.status())
+            elif command == "list":
+                return json.dumps({category: list(presets) for category, presets in self.all_presets.items()})
+            elif command == "quit":
+                self.stopped.set()
+            else:
+                return f"error unknown command: {command}"
+        except Exception as e:
+            return f"error {e}"
+        return "ok"
+
+    def start_control_server(self, host=CONTROL_HOST, port=CONTROL_PORT):
+        try:
+            self.server = ControlServer((host, port), ControlHandler)
+        except OSError as e:
+            print(f"Control socket unavailable on {host}:{port}: {e}")
+            return
+        self.server.nova = self
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="ControlServer").start()
+        print(f"Control socket listening on {host}:{port}")
+
+    def install_signal_handlers(self):
+        def request_stop(signum, frame):
+            self.stopped.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.supervisor.request_reconnect())
+
+    def run(self, start=None, control_port=CONTROL_PORT):
+        self.install_signal_handlers()
+        if control_port:
+            self.start_control_server(port=control_port)
+
+        self.sender.start()
+        self.player.start()
+        self.supervisor.start()
+
+        try:
+            (start or self.play_last)()
+        except Exception as e:
+            print(f"Could not start: {e}")
+
+        try:
+            # Short waits keep Ctrl+C responsive on Windows
+            while not self.stopped.wait(0.5):
+                pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.supervisor.stop()
+        self.player.stop()
+        self.sender.stop()
+        self.animations.close()
+        stats = self.sender.get_stats()
+        print(f"Frames sent: {stats['sent']}, coalesced: {stats['coalesced']}, failed: {stats['failed']}, "
+              f"dropped: {stats['dropped']}, unchanged: {self.controller.suppressed_count}")
+        self.controller.cleanup()
+
+def send_command(command, host=CONTROL_HOST, port=CONTROL_PORT):
+    with socket.create_connection((host, port), timeout=2) as conn:
+        conn.sendall((command + "\n").encode('utf-8'))
+        reply = conn.makefile('r', encoding='utf-8').readline()
+    return reply.strip()
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Run Nova Pro X presets without the GUI")
+    parser.add_argument("--preset", help="Preset id to play, defaults to the last preset in settings")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--playlist", nargs='?', const='', default=None,
+                        help="Play a playlist, e.g. \"clock:10,japanese_rain:30\"; empty uses [Playlist] from settings")
+    parser.add_argument("--text", nargs=3, metavar="LINE", help="Show three lines of custom text")
+    parser.add_argument("--speed", type=float, help="Animation speed in ms")
+    parser.add_argument("--config", default=CONFIG_FILE)
+    parser.add_argument("--port", type=int, default=CONTROL_PORT, help="Control socket port, 0 disables it")
+    parser.add_argument("--list", action="store_true", help="List preset ids and exit")
+    parser.add_argument("--send", metavar="COMMAND", help="Send a command to a running daemon and exit")
+    args = parser.parse_args(argv)
+
+    if args.send:
+        try:
+            print(send_command(args.send, port=args.port))
+        except OSError as e:
+            print(f"No daemon reachable on port {args.port}: {e}")
+            return 1
+        return 0
+
+    daemon = NovaDaemon(args.config)
+
+    if args.list:
+        for category, presets in daemon.all_presets.items():
+            print(f"{category}: {', '.join(presets)}")
+        return 0
+
+    if args.speed is not None:
+        daemon.player.set_speed(args.speed)
+
+    start = None
+    if args.text:
+        start = lambda: daemon.play_custom(args.text)
+    elif args.playlist is not None:
+        start = lambda: daemon.play_playlist(args.playlist or None)
+    elif args.preset:
+        start = lambda: daemon.play_preset(args.preset, args.seed)
+
+    print(f"=== Nova Pro X Ultimate Controller {VERSION} (headless) ===")
+    daemon.run(start, args.port)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,21 @@
+import config
+
+class FrameCache:
+    def __init__(self):
+        self.cycles = {}
+        self.width = None
+
+    def frames(self, name, render_cycle):
+        width = config.CHAR_LIMIT
+        if width != self.width:
+            self.cycles.clear()
+            self.width = width
+
+        frames = self.cycles.get(name)
+        if frames is None:
+            frames = render_cycle(width)
+            self.cycles[name] = frames
+        return frames
+
+    def clear(self):
+        self.cycles.clear()
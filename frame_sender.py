@@ -0,0 +1,86 @@
+import threading
+from controller import UNCHANGED
+
+class FrameSender:
+    def __init__(self, controller, on_result=None):
+        self.controller = controller
+        self.on_result = on_result
+        self.condition = threading.Condition()
+        self.pending = None
+        self.running = False
+        self.thread = None
+        self.sent_count = 0
+        self.coalesced_count = 0
+        self.failed_count = 0
+        self.dropped_count = 0
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+
+        self.thread = threading.Thread(target=self.run, daemon=True, name="FrameSender")
+        self.thread.start()
+
+    def stop(self, timeout=1.0):
+        with self.condition:
+            self.running = False
+            self.pending = None
+            self.condition.notify()
+
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+        self.thread = None
+
+    def submit(self, line1="", line2="", line3=""):
+        # Latest frame wins: an unsent frame still waiting here is simply replaced
+        with self.condition:
+            if not self.controller.is_connected:
+                # Nothing queues up while the supervisor reconnects; the next frame after it does is current
+                self.dropped_count += 1
+                return
+
+            if self.pending is not None:
+                self.coalesced_count += 1
+            self.pending = (line1, line2, line3)
+            self.condition.notify()
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                "sent": self.sent_count,
+                "coalesced": self.coalesced_count,
+                "failed": self.failed_count,
+                "dropped": self.dropped_count
+            }
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+
+                if not self.running:
+                    break
+
+                lines = self.pending
+                self.pending = None
+
+            try:
+                ok = self.controller.display(*lines)
+            except Exception:
+                ok = False
+
+            # Skipped duplicates are counted by the controller and say nothing about the connection
+            if ok is UNCHANGED:
+                continue
+
+            with self.condition:
+                if ok:
+                    self.sent_count += 1
+                else:
+                    self.failed_count += 1
+
+            if self.on_result:
+                self.on_result(ok)
@@ -0,0 +1,58 @@
+class FrameBuffer:
+    __slots__ = ('width', 'height', 'cells', 'blank', 'lines')
+
+    def __init__(self, width, height=3, fill=' '):
+        self.width = width
+        self.height = height
+        self.blank = [fill] * (width * height)
+        self.cells = list(self.blank)
+        self.lines = None
+
+    def clear(self):
+        self.cells[:] = self.blank
+        self.lines = None
+
+    def get(self, row, col):
+        return self.cells[row * self.width + col]
+
+    def set(self, row, col, char):
+        if 0 <= row < self.height and 0 <= col < self.width:
+            self.cells[row * self.width + col] = char
+            self.lines = None
+
+    def fill(self, values, table):
+        # Cell i becomes table[values[i]], clamped to the last glyph; written in place so
+        # a per-frame heat map never builds a temporary list
+        cells = self.cells
+        last = len(table) - 1
+        for i in range(len(values)):
+            value = values[i]
+            cells[i] = table[value if value < last else last]
+        self.lines = None
+
+    def clear_column(self, col):
+        for row in range(self.height):
+            self.cells[row * self.width + col] = self.blank[0]
+        self.lines = None
+
+    def blit(self, row, col, text):
+        if not 0 <= row < self.height:
+            return
+
+        start = max(0, col)
+        end = min(self.width, col + len(text))
+        if start < end:
+            base = row * self.width
+            self.cells[base + start:base + end] = text[start - col:end - col]
+            self.lines = None
+
+    def draw_sprite(self, row, col, sprite):
+        for i, line in enumerate(sprite):
+            if line:
+                self.blit(row + i, col, line)
+
+    def to_lines(self):
+        if self.lines is None:
+            width = self.width
+            self.lines = [''.join(self.cells[row * width:(row + 1) * width]) for row in range(self.height)]
+        return self.lines
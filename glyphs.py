@@ -0,0 +1,10 @@
+# Glyph sets shared by the pure-Python animations and the NumPy particle engine.
+# Tuples rather than strings: indexing a str builds a new object for every
+# non-Latin-1 character, a tuple hands back the same one each frame.
+
+JAPANESE_CHARS = tuple("あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん")
+RAIN_CHARS = ('|', '¦', '┆', '┊', '╎', '╏')
+FIRE_CHARS = (' ', '·', ':', '▪', '▫', '▬', '▲', '▼')
+SNOWFLAKE_CHARS = ('❄', '❅', '❆', '*', '·', '◦')
+SPARKLE_CHARS = ('·', '•', '*', '✦', '✧', '★')
+ANIME_SPARKLE_CHARS = ('✧', '✦', '✩', '✪', '⋆', '｡', '°', '∘')
@@ -0,0 +1,213 @@
+import subprocess
+import sys
+import threading
+import time
+
+from config import GPU_BACKEND
+from lazy import installed, load
+
+HAS_NVML = installed("pynvml")
+
+NVIDIA_SMI_QUERY = ["nvidia-smi", "--query-gpu=utilization.gpu,temperature.gpu,name", "--format=csv,noheader,nounits"]
+
+def hidden_window_options():
+    if sys.platform == "win32":
+        si = subprocess.STARTUPINFO()
+        si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        si.wShowWindow = subprocess.SW_HIDE
+        return {"startupinfo": si, "creationflags": subprocess.CREATE_NO_WINDOW}
+    return {}
+
+def parse_nvidia_smi_line(line):
+    values = line.strip().split(', ')
+    if len(values) >= 3:
+        return {
+            "load": float(values[0]) / 100,
+            "temperature": float(values[1]),
+            "name": values[2]
+        }
+    return None
+
+def get_gpu_info():
+    try:
+        result = subprocess.run(
+            NVIDIA_SMI_QUERY,
+            capture_output=True,
+            text=True,
+            **hidden_window_options()
+        )
+
+        if result.returncode == 0:
+            lines = result.stdout.strip().split('\n')
+            if lines and lines[0]:
+                return parse_nvidia_smi_line(lines[0])
+    except:
+        pass
+
+    return None
+
+class NvmlBackend:
+    name = "nvml"
+
+    def __init__(self):
+        self.nvml = pynvml = load("pynvml")
+        pynvml.nvmlInit()
+        self.handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+        gpu_name = pynvml.nvmlDeviceGetName(self.handle)
+        if isinstance(gpu_name, bytes):
+            gpu_name = gpu_name.decode('utf-8', errors='ignore')
+        self.gpu_name = gpu_name
+
+    def read(self):
+        try:
+            pynvml = self.nvml
+            utilization = pynvml.nvmlDeviceGetUtilizationRates(self.handle)
+            temperature = pynvml.nvmlDeviceGetTemperature(self.handle, pynvml.NVML_TEMPERATURE_GPU)
+            return {
+                "load": utilization.gpu / 100,
+                "temperature": float(temperature),
+                "name": self.gpu_name
+            }
+        except Exception:
+            return None
+
+    def close(self):
+        try:
+            self.nvml.nvmlShutdown()
+        except Exception:
+            pass
+
+class NvidiaSmiStreamBackend:
+    name = "nvidia-smi-loop"
+    restart_delay = 10.0
+
+    def __init__(self, interval_ms=1000, first_sample_timeout=3.0):
+        self.interval_ms = interval_ms
+        self.latest = None
+        self.process = None
+        self.started_at = 0
+        self.first_sample = threading.Event()
+        self.start()
+
+        # nvidia-smi without a usable GPU exits at once, don't sit out the whole timeout
+        deadline = time.monotonic() + first_sample_timeout
+        while not self.first_sample.wait(0.05):
+            if self.process.poll() is not None or time.monotonic() >= deadline:
+                self.close()
+                raise RuntimeError("nvidia-smi produced no samples")
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.process = subprocess.Popen(
+            NVIDIA_SMI_QUERY + ["--id=0", f"--loop-ms={self.interval_ms}"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            **hidden_window_options()
+        )
+        threading.Thread(target=self.read_loop, args=(self.process,), daemon=True, name="NvidiaSmiReader").start()
+
+    def read_loop(self, process):
+        for line in process.stdout:
+            try:
+                info = parse_nvidia_smi_line(line)
+            except ValueError:
+                continue
+            if info:
+                self.latest = info
+                self.first_sample.set()
+
+    def read(self):
+        if self.process is not None and self.process.poll() is not None:
+            self.latest = None
+            if time.monotonic() - self.started_at > self.restart_delay:
+                try:
+                    self.start()
+                except OSError:
+                    pass
+        return self.latest
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.terminate()
+                self.process.wait(timeout=1)
+            except Exception:
+                pass
+        self.process = None
+
+class OneShotBackend:
+    name = "nvidia-smi"
+
+    def read(self):
+        return get_gpu_info()
+
+    def close(self):
+        pass
+
+class NullBackend:
+    name = "none"
+
+    def read(self):
+        return None
+
+    def close(self):
+        pass
+
+class FakeGpuBackend:
+    name = "fake"
+
+    def __init__(self, load=0.5, temperature=60.0, gpu_name="Fake GPU"):
+        self.load = load
+        self.temperature = temperature
+        self.gpu_name = gpu_name
+        self.read_count = 0
+        self.closed = False
+
+    def read(self):
+        self.read_count += 1
+        return {
+            "load": self.load,
+            "temperature": self.temperature,
+            "name": self.gpu_name
+        }
+
+    def close(self):
+        self.closed = True
+
+BACKENDS = {
+    "nvml": NvmlBackend,
+    "nvidia-smi-loop": NvidiaSmiStreamBackend,
+    "nvidia-smi": OneShotBackend,
+    "none": NullBackend,
+    "fake": FakeGpuBackend,
+}
+
+def create_gpu_backend(interval_ms=1000, mode=GPU_BACKEND):
+    # "auto" probes NVML, then the nvidia-smi loop, then one-shot nvidia-smi; any other
+    # mode forces that backend, e.g. "fake" on machines without a GPU
+    if mode != "auto":
+        try:
+            if mode == "nvidia-smi-loop":
+                return NvidiaSmiStreamBackend(interval_ms)
+            return BACKENDS[mode]()
+        except Exception as e:
+            print(f"GPU backend {mode} unavailable: {e}")
+            return NullBackend()
+
+    if HAS_NVML:
+        try:
+            return NvmlBackend()
+        except Exception:
+            pass
+
+    try:
+        return NvidiaSmiStreamBackend(interval_ms)
+    except Exception:
+        pass
+
+    if get_gpu_info() is not None:
+        return OneShotBackend()
+
+    return NullBackend()
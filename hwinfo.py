@@ -0,0 +1,117 @@
+import mmap
+import struct
+
+HWINFO_SHARED_MEMORY = "Global\\HWiNFO_SENS_SM2"
+HWINFO_SIGNATURE = b'HWiS'
+
+# Packed layouts from HWiNFO's shared memory SDK (pragma pack 1)
+HEADER = struct.Struct('<4sIIqIIIIII')
+SENSOR = struct.Struct('<II128s128s')
+READING = struct.Struct('<III128s128s16s')
+VALUE = struct.Struct('<d')
+
+READING_NONE = 0
+READING_TEMPERATURE = 1
+READING_VOLTAGE = 2
+READING_FAN = 3
+READING_CURRENT = 4
+READING_POWER = 5
+READING_CLOCK = 6
+READING_USAGE = 7
+READING_OTHER = 8
+
+def decode_name(raw):
+    return raw.split(b'\0', 1)[0].decode('latin-1', errors='ignore')
+
+class HWiNFOReading:
+    __slots__ = ('reading_type', 'sensor_name', 'label', 'unit', 'value_offset')
+
+    def __init__(self, reading_type, sensor_name, label, unit, value_offset):
+        self.reading_type = reading_type
+        self.sensor_name = sensor_name
+        self.label = label
+        self.unit = unit
+        self.value_offset = value_offset
+
+class HWiNFOReader:
+    def __init__(self, path=None, tagname=HWINFO_SHARED_MEMORY):
+        self.path = path
+        self.tagname = tagname
+        self.file = None
+        self.mm = None
+        self.layout = None
+        self.readings = []
+
+    def open(self):
+        if self.path:
+            self.file = open(self.path, 'rb')
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            with mmap.mmap(-1, HEADER.size, tagname=self.tagname, access=mmap.ACCESS_READ) as header:
+                size = self.mapping_size(HEADER.unpack_from(header, 0)[4:])
+            self.mm = mmap.mmap(-1, size, tagname=self.tagname, access=mmap.ACCESS_READ)
+
+        self.build_index()
+
+    @staticmethod
+    def mapping_size(layout):
+        sensor_offset, sensor_size, sensor_count, reading_offset, reading_size, reading_count = layout
+        return max(HEADER.size, sensor_offset + sensor_size * sensor_count, reading_offset + reading_size * reading_count)
+
+    def read_layout(self):
+        header = HEADER.unpack_from(self.mm, 0)
+        if header[0] != HWINFO_SIGNATURE:
+            return None
+        return header[4:]
+
+    def build_index(self):
+        self.layout = self.read_layout()
+        if self.layout is None:
+            raise ValueError("HWiNFO shared memory is not active")
+
+        sensor_offset, sensor_size, sensor_count, reading_offset, reading_size, reading_count = self.layout
+        if self.mapping_size(self.layout) > len(self.mm):
+            raise ValueError("HWiNFO shared memory is truncated")
+
+        sensor_names = []
+        for i in range(sensor_count):
+            _, _, name_orig, name_user = SENSOR.unpack_from(self.mm, sensor_offset + i * sensor_size)
+            sensor_names.append(decode_name(name_user) or decode_name(name_orig))
+
+        self.readings = []
+        for i in range(reading_count):
+            offset = reading_offset + i * reading_size
+            reading_type, sensor_index, _, label_orig, label_user, unit = READING.unpack_from(self.mm, offset)
+            sensor_name = sensor_names[sensor_index] if sensor_index < len(sensor_names) else ""
+            self.readings.append(HWiNFOReading(
+                reading_type,
+                sensor_name,
+                decode_name(label_user) or decode_name(label_orig),
+                decode_name(unit),
+                offset + READING.size
+            ))
+
+    def is_stale(self):
+        # HWiNFO rewrites the tables when it restarts or sensors change
+        return self.mm is None or self.read_layout() != self.layout
+
+    def find(self, reading_type, *keywords):
+        for reading in self.readings:
+            if reading.reading_type == reading_type:
+                name = f"{reading.sensor_name} {reading.label}".upper()
+                if all(keyword in name for keyword in keywords):
+                    return reading
+        return None
+
+    def value(self, reading):
+        return VALUE.unpack_from(self.mm, reading.value_offset)[0]
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.layout = None
+        self.readings = []
@@ -0,0 +1,17 @@
+import importlib
+import importlib.util
+
+modules = {}
+
+def installed(name):
+    # find_spec only locates the package, so availability checks cost no import
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def load(name):
+    module = modules.get(name)
+    if module is None:
+        module = modules[name] = importlib.import_module(name)
+    return module
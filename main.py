@@ -12,135 +12,55 @@ import os
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
 import customtkinter as ctk
-import json
-import requests
 import time
 import threading
-import queue
 import configparser
 from config import *
+from controller import OLEDController
+from lazy import installed
 from animations import AnimationFunctions
+from registry import CUSTOM_SPEC
+from plugins import register_plugins
+from frame_sender import FrameSender
+from supervisor import ConnectionSupervisor
+from player import Player, Playlist, create_program, static_program, parse_playlist, clamp_speed
+from random_streams import new_seed
+from temperature import discover_sources, format_discovery
 from ascii_manager import ASCIIArtManager, PresetManager
+from clips import load_clip_presets
 from ui import NovaUI
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
-def get_server_url():
-    try:
-        if os.name == 'nt':
-            config_path = os.path.join(os.environ.get('PROGRAMDATA', 'C:\\ProgramData'), 
-                                     'SteelSeries', 'SteelSeries Engine 3', 'coreProps.json')
-        else:
-            config_path = os.path.expanduser('~/Library/Application Support/SteelSeries Engine 3/coreProps.json')
-        
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                return f"http://{config['address']}"
-    except:
-        pass
-    
-    return DEFAULT_SERVER_URL
-
-class OLEDController:
-    def __init__(self):
-        self.server_url = get_server_url()
-        self.game_name = GAME_NAME
-        self.current_value = 0
-        self.is_connected = False
-        
-    def setup(self):
-        self.is_connected = False
-        try:
-            requests.post(f"{self.server_url}/remove_game", json={"game": self.game_name}, timeout=2)
-            time.sleep(0.2)
-            
-            metadata = {
-                "game": self.game_name,
-                "game_display_name": GAME_DISPLAY_NAME,
-                "developer": DEVELOPER
-            }
-            requests.post(f"{self.server_url}/game_metadata", json=metadata, timeout=2)
-            
-            bind_data = {
-                "game": self.game_name,
-                "event": "DISPLAY",
-                "handlers": [{
-                    "device-type": "screened",
-                    "zone": "one",
-                    "mode": "screen",
-                    "datas": [{
-                        "lines": [
-                            {"has-text": True, "context-frame-key": "l1"},
-                            {"has-text": True, "context-frame-key": "l2"},
-                            {"has-text": True, "context-frame-key": "l3"}
-                        ]
-                    }]
-                }]
-            }
-            response = requests.post(f"{self.server_url}/bind_game_event", json=bind_data, timeout=2)
-            self.is_connected = response.status_code == 200
-            return self.is_connected
-        except:
-            self.is_connected = False
-            return False
-    
-    def display(self, line1="", line2="", line3=""):
-        if not self.is_connected:
-            return False
-            
-        self.current_value = (self.current_value + 1) % 100
-        
-        line1_display = str(line1).replace(' ', BLANK_SPACE_CHAR)
-        line2_display = str(line2).replace(' ', BLANK_SPACE_CHAR)
-        line3_display = str(line3).replace(' ', BLANK_SPACE_CHAR)
-        
-        data = {
-            "game": self.game_name,
-            "event": "DISPLAY",
-            "data": {
-                "value": self.current_value,
-                "frame": {
-                    "l1": line1_display[:CHAR_LIMIT],
-                    "l2": line2_display[:CHAR_LIMIT],
-                    "l3": line3_display[:CHAR_LIMIT]
-                }
-            }
-        }
-        
-        try:
-            response = requests.post(f"{self.server_url}/game_event", json=data, timeout=0.5)
-            return response.status_code == 200
-        except Exception as e:
-            return False
-    
-    def cleanup(self):
-        try:
-            for _ in range(3):
-                self.display("", "", "")
-                time.sleep(0.01)
-            requests.post(f"{self.server_url}/remove_game", json={"game": self.game_name}, timeout=1)
-        except:
-            pass
-
 class NovaProUltimateGUI:
     def __init__(self):
         self.controller = OLEDController()
+        self.supervisor = ConnectionSupervisor(self.controller, self.on_connection_change)
+        self.sender = FrameSender(self.controller, self.supervisor.report)
         self.animations = AnimationFunctions()
         self.ascii_manager = ASCIIArtManager()
         self.current_preset = None
-        self.animation_thread = None
         self.animation_running = False
-        self.update_queue = queue.Queue(maxsize=100)
+        self.preview_lock = threading.Lock()
+        self.preview_pending = None
+        self.preview_wakeup = False
+        self.preview_painted = 0.0
+        self.closing = False
         self.current_speed = DEFAULT_SPEED_MS
         self.settings_loaded = False  
+        self.auto_started = False
+        self.player = Player(self.animations.sensors, self.output_frame, self.build_program, self.on_player_switch)
         
         self.config = configparser.ConfigParser()
         self.config_file = CONFIG_FILE
         
+        plugin_count = register_plugins()
+        if plugin_count:
+            print(f"Registered {plugin_count} plugin presets")
+        
         ascii_arts = self.ascii_manager.load_ascii_arts()
-        self.all_presets = PresetManager.get_all_presets(ascii_arts)
+        self.all_presets = PresetManager.get_all_presets(ascii_arts, load_clip_presets())
         
         self.root = ctk.CTk()
         self.root.title("Nova Pro X Ultimate Controller")
@@ -154,49 +74,109 @@ class NovaProUltimateGUI:
             self.clear_display,
             self.stop_animation,
             self.on_speed_change,
-            self.on_speed_release  
+            self.on_speed_release,
+            self.start_playlist
         )
         
         self.ui.set_presets(self.all_presets)
+        self.sender.start()
         self.load_settings()
+        self.player.set_speed(self.current_speed)
+        self.player.start()
         self.connect_device()
-        self.process_queue()
+        self.start_temperature_discovery()
+        self.root.bind("<<PreviewFrame>>", self.on_preview_frame)
+        self.poll_frame_stats()
         
     def connect_device(self):
-        try:
-            if self.controller.setup():
-                self.ui.set_status(True)
-                self.ui.update_device_info()
-                
-                self.controller.display("", "", "")
+        # The remove/metadata/bind handshake blocks for a few hundred ms, the supervisor runs it
+        # off the UI thread and repeats it with backoff whenever GameSense goes away
+        self.ui.set_status(False, "Connecting...")
+        self.supervisor.start()
+    
+    def on_connection_change(self, connected):
+        if not self.closing:
+            self.root.after(0, self.on_device_setup, connected)
+    
+    def on_device_setup(self, connected):
+        if connected:
+            self.ui.set_status(True)
+            self.ui.update_device_info()
+            
+            if not self.animation_running:
+                self.sender.submit("", "", "")
                 self.ui.update_preview("", "", "")
-                
-                if hasattr(self.ui, 'auto_start') and self.ui.auto_start.get():
-                    last_preset = getattr(self, 'loaded_last_preset', '')
-                    if last_preset:
-                        self.root.after(500, self.load_last_preset)
-            else:
-                self.ui.set_status(False)
-        except:
+            
+            if not self.auto_started and hasattr(self.ui, 'auto_start') and self.ui.auto_start.get():
+                self.auto_started = True
+                last_preset = getattr(self, 'loaded_last_preset', '')
+                if last_preset:
+                    self.root.after(500, self.load_last_preset)
+        elif connected is None:
             self.ui.set_status(False, "Error")
+        else:
+            self.ui.set_status(False)
+    
+    def start_temperature_discovery(self):
+        threading.Thread(
+            target=self.discover_temperature_sources,
+            daemon=True,
+            name="TemperatureDiscovery"
+        ).start()
+    
+    def discover_temperature_sources(self):
+        try:
+            results = discover_sources()
+            print(format_discovery(results))
+            
+            ranking = [result["name"] for result in results]
+            self.animations.temperature.set_order(ranking)
+            self.root.after(0, self.save_temperature_ranking, ranking)
+        except Exception as e:
+            print(f"Temperature discovery failed: {e}")
     
-    def process_queue(self):
+    def save_temperature_ranking(self, ranking):
+        if not self.config.has_section('Diagnostics'):
+            self.config.add_section('Diagnostics')
+        self.config.set('Diagnostics', 'temperature_sources', ','.join(ranking))
+        self.save_settings()
+    
+    def on_preview_frame(self, event=None):
+        # Paint at most once per refresh interval; frames arriving in between are coalesced
+        delay = self.preview_painted + 1.0 / PREVIEW_REFRESH_HZ - time.monotonic()
+        if delay > 0:
+            self.root.after(int(delay * 1000) + 1, self.paint_preview)
+        else:
+            self.paint_preview()
+    
+    def paint_preview(self):
+        with self.preview_lock:
+            lines = self.preview_pending
+            self.preview_pending = None
+            self.preview_wakeup = False
+        
+        if lines is not None:
+            self.preview_painted = time.monotonic()
+            self.ui.update_preview(*lines)
+    
+    def poll_frame_stats(self):
         if not hasattr(self, 'root') or not self.root.winfo_exists():
             return
-            
+        
+        self.update_frame_stats()
+        
         try:
-            for _ in range(10):
-                try:
-                    lines = self.update_queue.get_nowait()
-                    if lines and len(lines) == 3:
-                        self.ui.update_preview(*lines)
-                except queue.Empty:
-                    break
+            self.root.after(500, self.poll_frame_stats)
         except:
             pass
-        
+    
+    def update_frame_stats(self):
         try:
-            self.root.after(50, self.process_queue)
+            stats = self.player.get_stats()
+            if stats:
+                self.ui.update_frame_stats(stats["fps"], stats["jitter_ms"])
+            else:
+                self.ui.update_frame_stats(None)
         except:
             pass
     
@@ -212,122 +192,93 @@ class NovaProUltimateGUI:
             if hasattr(self, 'settings_loaded') and self.settings_loaded:
                 self.save_settings()
             
-            if self.animation_running and self.current_preset:
-                print(f"Restarting animation with new speed: {int(value)}ms")
-                
-                current_preset_id = self.current_preset
-                current_preset_data = None
-                
-                if current_preset_id == "custom_text":
-                    lines = [entry.get()[:CHAR_LIMIT] for entry in self.ui.line_entries]
-                    self.send_custom(lines)
-                    return
-                else:
-                    for category, presets in self.all_presets.items():
-                        if current_preset_id in presets:
-                            current_preset_data = presets[current_preset_id]
-                            break
-                
-                if current_preset_data:
-                    self.load_preset(current_preset_id, current_preset_data)
+            self.player.set_speed(value)
     
-    def stop_animation(self):
-        self.animation_running = False
+    def find_preset(self, preset_id):
+        for category, presets in self.all_presets.items():
+            if preset_id in presets:
+                return presets[preset_id]
+        return None
+    
+    def build_program(self, preset_id):
+        preset_data = self.find_preset(preset_id)
+        if preset_data is None:
+            raise ValueError(f"Unknown preset: {preset_id}")
+        return create_program(self.animations, preset_id, preset_data)
+    
+    def output_frame(self, lines):
+        self.sender.submit(*lines)
+        
+        with self.preview_lock:
+            self.preview_pending = lines
+            if self.preview_wakeup or self.closing:
+                return
+            self.preview_wakeup = True
         
         try:
-            if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
-                self.ui.stop_btn.configure(state="disabled")
+            self.root.event_generate("<<PreviewFrame>>", when="tail")
+        except Exception:
+            with self.preview_lock:
+                self.preview_wakeup = False
+    
+    def on_player_switch(self, program):
+        if self.closing:
+            return
+        try:
+            self.root.after(0, self.show_program, program)
         except:
             pass
+    
+    def show_program(self, program):
+        self.animation_running = program is not None
+        self.ui.stop_btn.configure(state="normal" if program else "disabled")
+        self.ui.set_speed_enabled(program is None or program.spec.period is None)
         
-        if self.animation_thread:
-            if self.animation_thread.is_alive():
-                self.animation_thread.join(timeout=1.0)
-        
-        self.animation_thread = None
+        if program is not None and self.player.active_playlist is not None:
+            self.ui.update_button_colors(program.preset_id)
+    
+    def discard_preview(self):
+        with self.preview_lock:
+            self.preview_pending = None
+    
+    def stop_animation(self):
+        self.animation_running = False
         
-        cleared = 0
         try:
-            while not self.update_queue.empty() and cleared < 100:
-                self.update_queue.get_nowait()
-                cleared += 1
+            if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
+                self.ui.stop_btn.configure(state="disabled")
+            self.ui.set_speed_enabled(True)
         except:
             pass
         
-        self.controller.display("", "", "")
+        self.player.play(None)
+        self.discard_preview()
         self.ui.update_preview("", "", "")
-        
-        time.sleep(0.1)
     
     def load_preset(self, preset_id, preset_data):
         try:
-            self.stop_animation()
-            
-            self.controller.display("", "", "")
-            self.ui.update_preview("", "", "")
-            time.sleep(0.05)
-            
-            self.animations.reset_all()
+            seed = self.choose_seed(preset_id, preset_data)
+            if seed is None:
+                seed = new_seed()
+            self.record_seed(preset_id, seed)
             self.current_preset = preset_id
             
-            while not self.update_queue.empty():
-                try:
-                    self.update_queue.get_nowait()
-                except:
-                    break
-            
+            self.discard_preview()
             self.ui.update_button_colors(preset_id)
             
             if preset_data["type"] == "static":
-                lines = preset_data["lines"]
-                
-                def make_static_display(static_lines):
-                    def static_display():
-                        return list(static_lines)
-                    return static_display
-                
-                static_func = make_static_display(lines)
-                static_func.__name__ = 'static_display'
-                
-                self.animation_running = True
-                if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
-                    self.ui.stop_btn.configure(state="normal")
-                
-                self.controller.display(*lines)
-                self.ui.update_preview(*lines)
-                
-                self.start_animation_thread(static_func, self.current_speed)
-                
-            elif preset_data["type"] in ["dynamic", "animation"]:
-                self.animation_running = True
-                
-                if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
-                    self.ui.stop_btn.configure(state="normal")
-                
-                func_name = preset_data["func"]
-                
-                try:
-                    func = getattr(self.animations, func_name)
-                    
-                    try:
-                        test_result = func()
-                        if not test_result or len(test_result) != 3:
-                            print(f"Invalid function result: {test_result}")
-                            self.animation_running = False
-                            return
-                    except Exception as test_e:
-                        print(f"Function test failed: {test_e}")
-                        self.animation_running = False
-                        return
-                    
-                    self.start_animation_thread(func, self.current_speed)
-                    
-                except Exception as e:
-                    print(f"Error in animation setup: {e}")
-                    self.animation_running = False
-                    if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
-                        self.ui.stop_btn.configure(state="disabled")
+                self.sender.submit(*preset_data["lines"])
+                self.ui.update_preview(*preset_data["lines"])
+            
+            def start():
+                self.animations.reseed(seed)
+                return create_program(self.animations, preset_id, preset_data)
+            
+            self.animation_running = True
+            if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
+                self.ui.stop_btn.configure(state="normal")
             
+            self.player.play(start)
             self.save_settings()
             
         except Exception as e:
@@ -336,97 +287,49 @@ class NovaProUltimateGUI:
             traceback.print_exc()
             self.animation_running = False
     
-    def start_animation_thread(self, func, speed):
-        try:
-            if self.animation_thread and self.animation_thread.is_alive():
-                self.animation_thread.join(timeout=1.0)
-            
-            self.animation_thread = threading.Thread(
-                target=self.run_animation,
-                args=(func, speed),
-                daemon=True,
-                name=f"Animation-{func.__name__ if hasattr(func, '__name__') else 'unknown'}"
-            )
-            self.animation_thread.start()
-        except Exception as e:
-            print(f"Error starting thread: {e}")
-            self.animation_running = False
-            self.root.after(0, lambda: self.ui.stop_btn.configure(state="disabled"))
-    
-    def run_animation(self, func, speed_ms):
-        func_name = func.__name__ if hasattr(func, '__name__') else 'unknown'
+    def start_playlist(self):
+        items = parse_playlist(self.config.get('Playlist', 'items', fallback=''))
+        if not items:
+            print("No playlist configured, add [Playlist] items = clock:10, japanese_rain:30 to " + self.config_file)
+            return
         
-        if func_name == 'show_clock':
-            interval = 1.0
-        elif func_name == 'show_gpu_cpu_ram':
-            interval = 1.0
-        elif func_name == 'show_ram_network_uptime':
-            interval = 1.0
-        elif func_name == 'show_temperatures':
-            interval = 2.0
-        elif func_name == 'show_system':
-            interval = 2.0
-        elif func_name == 'show_network':
-            interval = 5.0
-        elif func_name == 'static_display':
-            interval = 1.0
-        elif func_name == 'custom_display':
-            interval = 1.0
-        elif 'show_' in func_name:
-            interval = 1.0
-        else:
-            interval = self.current_speed / 1000.0
+        transition = self.config.get('Playlist', 'transition', fallback=PLAYLIST_TRANSITION)
+        self.current_preset = "playlist"
+        self.animation_running = True
+        if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
+            self.ui.stop_btn.configure(state="normal")
         
-        error_count = 0
-        max_errors = 5
+        self.discard_preview()
+        self.player.play_playlist(Playlist(items, transition))
+        self.save_settings()
+    
+    def choose_seed(self, preset_id, preset_data):
+        if "seed" in preset_data:
+            return int(preset_data["seed"])
         
-        while self.animation_running and error_count < max_errors:
-            try:
-                if not self.animation_running:
-                    break
-                
-                lines = func()
-                if not lines or not isinstance(lines, (list, tuple)) or len(lines) != 3:
-                    error_count += 1
-                    continue
-                
-                if self.controller.is_connected:
-                    self.controller.display(*lines)
-                
-                try:
-                    self.update_queue.put(lines, block=False)
-                except queue.Full:
-                    pass
-                
-                error_count = 0
-                
-            except Exception as e:
-                error_count += 1
-                if error_count == 1:
-                    print(f"Animation error: {e}")
-            
-            time.sleep(interval)
+        if hasattr(self.ui, 'replay') and self.ui.replay.get():
+            if self.config.has_option('Seeds', preset_id):
+                return self.config.getint('Seeds', preset_id)
+        
+        return None
+    
+    def record_seed(self, preset_id, seed):
+        if not self.config.has_section('Seeds'):
+            self.config.add_section('Seeds')
+        self.config.set('Seeds', preset_id, str(seed))
     
     def send_custom(self, lines):
-        self.stop_animation()
         self.current_preset = "custom_text"
         
-        def make_custom_display(custom_lines):
-            def custom_display():
-                return list(custom_lines)
-            return custom_display
-        
-        custom_func = make_custom_display(lines)
-        custom_func.__name__ = 'custom_display'
-        
         self.animation_running = True
         if hasattr(self.ui, 'stop_btn') and self.ui.stop_btn:
             self.ui.stop_btn.configure(state="normal")
         
-        self.controller.display(*lines)
+        self.discard_preview()
+        self.sender.submit(*lines)
         self.ui.update_preview(*lines)
         
-        self.start_animation_thread(custom_func, self.current_speed)
+        self.player.play(lambda: static_program("custom_text", lines, CUSTOM_SPEC))
         
         self.ui.update_button_colors(None)
         self.save_settings()
@@ -435,7 +338,7 @@ class NovaProUltimateGUI:
         self.stop_animation()
         self.animations.reset_all()
         self.current_preset = None
-        self.controller.display("", "", "")
+        self.sender.submit("", "", "")
         self.ui.update_preview("", "", "")
         self.ui.clear_custom_text()
         self.ui.update_button_colors(None)
@@ -453,6 +356,9 @@ class NovaProUltimateGUI:
             if hasattr(self.ui, 'auto_start'):
                 self.config.set('Settings', 'auto_start', str(self.ui.auto_start.get()))
             
+            if hasattr(self.ui, 'replay'):
+                self.config.set('Settings', 'replay', str(self.ui.replay.get()))
+            
             self.config.set('Settings', 'last_preset', self.current_preset or '')
             
             for i, entry in enumerate(self.ui.line_entries):
@@ -486,8 +392,11 @@ class NovaProUltimateGUI:
                     if hasattr(self.ui, 'auto_start'):
                         self.ui.auto_start.select()
                 
+                if hasattr(self.ui, 'replay') and self.config.getboolean('Settings', 'replay', fallback=False):
+                    self.ui.replay.select()
+                
                 if hasattr(self.ui, 'speed_slider') and self.config.has_option('Settings', 'speed'):
-                    speed = self.config.getfloat('Settings', 'speed')
+                    speed = clamp_speed(self.config.getfloat('Settings', 'speed'))
                     self.ui.speed_slider.set(speed)
                     self.ui.update_speed(speed)
                     self.current_speed = speed
@@ -503,6 +412,10 @@ class NovaProUltimateGUI:
                         custom_lines_loaded.append("")
                         
                 print(f"Custom lines loaded from config: {custom_lines_loaded}")
+                
+                ranking = self.config.get('Diagnostics', 'temperature_sources', fallback='')
+                if ranking:
+                    self.animations.temperature.set_order(ranking.split(','))
                 print(f"Settings loaded successfully")
                 
                 self.settings_loaded = True
@@ -534,11 +447,12 @@ class NovaProUltimateGUI:
                     print("No custom text found in entry fields")
             
             self.root.after(200, load_custom)
+        elif last_preset == "playlist":
+            self.start_playlist()
         elif last_preset:
-            for category, presets in self.all_presets.items():
-                if last_preset in presets:
-                    self.load_preset(last_preset, presets[last_preset])
-                    break
+            preset_data = self.find_preset(last_preset)
+            if preset_data:
+                self.load_preset(last_preset, preset_data)
     
     def run(self):
         try:
@@ -553,7 +467,14 @@ class NovaProUltimateGUI:
     
     def on_close(self):
         try:
-            self.stop_animation()
+            self.closing = True
+            self.supervisor.stop()
+            self.player.stop()
+            self.sender.stop()
+            self.animations.close()
+            stats = self.sender.get_stats()
+            print(f"Frames sent: {stats['sent']}, coalesced: {stats['coalesced']}, failed: {stats['failed']}, "
+                  f"dropped: {stats['dropped']}, unchanged: {self.controller.suppressed_count}")
             self.controller.cleanup()
             self.save_settings()
             self.root.destroy()
@@ -569,12 +490,7 @@ def main():
     required = ["customtkinter", "requests"]
     optional = ["psutil"]
     
-    missing = []
-    for pkg in required:
-        try:
-            __import__(pkg)
-        except ImportError:
-            missing.append(pkg)
+    missing = [pkg for pkg in required if not installed(pkg)]
     
     if missing:
         print(f"Missing required packages: {', '.join(missing)}")
@@ -584,12 +500,9 @@ def main():
     print(f"Character limit: {CHAR_LIMIT}")
     print(f"Space display: Unicode blank ({BLANK_SPACE_CHAR})")
     
-    if 'psutil' in optional:
-        try:
-            import psutil
-        except ImportError:
-            print("Note: Install psutil for system monitoring")
-            print("      pip install psutil")
+    if 'psutil' in optional and not installed('psutil'):
+        print("Note: Install psutil for system monitoring")
+        print("      pip install psutil")
     
     print("\nStarting application...\n")
     
@@ -0,0 +1,204 @@
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from random_streams import stream_seed
+from glyphs import JAPANESE_CHARS, RAIN_CHARS, FIRE_CHARS, SNOWFLAKE_CHARS, SPARKLE_CHARS, ANIME_SPARKLE_CHARS
+
+def glyph_table(chars):
+    # Index 0 is always blank so an all-zero grid renders as empty space
+    return np.array([' '] + list(chars))
+
+def render(table, grid):
+    return [''.join(row) for row in table[grid].tolist()]
+
+class RainField:
+    def __init__(self, width, height, chars, spawn_threshold, rng):
+        self.width = width
+        self.height = height
+        self.table = glyph_table(chars)
+        self.spawn_threshold = spawn_threshold
+        self.rng = rng
+        self.columns = np.arange(width)
+        self.positions = rng.integers(0, 11, width)
+        self.grid = np.zeros((height, width), dtype=np.intp)
+
+    def step(self):
+        positions = self.positions
+        active = positions > 0
+
+        head = active & (positions <= self.height)
+        self.grid[positions[head] - 1, self.columns[head]] = self.rng.integers(1, len(self.table), int(head.sum()))
+
+        tail = active & (positions > 1) & (positions <= self.height + 1)
+        self.grid[positions[tail] - 2, self.columns[tail]] = 0
+
+        positions[active] += 1
+
+        done = positions > self.height + 3
+        positions[done] = 0
+        self.grid[:, done] = 0
+
+        spawn = ~active & (self.rng.random(self.width) > self.spawn_threshold)
+        positions[spawn] = 1
+
+        return render(self.table, self.grid)
+
+class FireField:
+    def __init__(self, width, height, rng):
+        self.table = glyph_table(FIRE_CHARS[1:])
+        self.rng = rng
+        self.heat = np.zeros((height, width), dtype=np.intp)
+
+    def step(self):
+        heat = self.heat
+        height, width = heat.shape
+        heat[-1] = self.rng.integers(4, 8, width)
+
+        for row in range(height - 2, -1, -1):
+            below = heat[row + 1]
+            avg = (below[:-2] + below[1:-1] + below[2:]) // 3
+            flare = 2 if row == height - 2 else 1
+            heat[row, 1:-1] = np.maximum(0, avg + self.rng.integers(-2, flare, width - 2))
+
+        return render(self.table, np.minimum(heat, 7))
+
+class SnowField:
+    def __init__(self, width, height, rng):
+        self.width = width
+        self.height = height
+        self.table = glyph_table(SNOWFLAKE_CHARS)
+        self.rng = rng
+        self.scale = max(1, (width * height) // 45)
+        self.rows = rng.integers(0, height, 5 * self.scale)
+        self.cols = rng.integers(0, width, 5 * self.scale)
+        self.counter = 0
+
+    def step(self):
+        self.counter += 1
+        rows = self.rows + 1
+        cols = self.cols
+        if self.counter % 2 == 0:
+            cols = cols + self.rng.integers(-1, 2, len(cols))
+
+        keep = (rows < self.height) & (cols >= 0) & (cols < self.width)
+        rows, cols = rows[keep], cols[keep]
+
+        room = 8 * self.scale - len(rows)
+        if room > 0:
+            spawned = min(room, int((self.rng.random(self.scale) > 0.6).sum()))
+            rows = np.concatenate([rows, np.zeros(spawned, dtype=rows.dtype)])
+            cols = np.concatenate([cols, self.rng.integers(0, self.width, spawned)])
+
+        self.rows, self.cols = rows, cols
+
+        grid = np.zeros((self.height, self.width), dtype=np.intp)
+        grid[rows, cols] = self.rng.integers(1, len(self.table), len(rows))
+        return render(self.table, grid)
+
+class SparkleField:
+    def __init__(self, width, height, rng):
+        self.table = glyph_table(SPARKLE_CHARS)
+        self.rng = rng
+        self.scale = max(1, (width * height) // 45)
+        self.mask = np.zeros((height, width), dtype=bool)
+
+    def step(self):
+        mask = self.mask
+        mask &= self.rng.random(mask.shape) <= 0.7
+
+        room = 10 * self.scale - int(mask.sum())
+        spawned = min(max(room, 0), int(self.rng.integers(0, 3 * self.scale + 1)))
+        if spawned:
+            flat = self.rng.integers(0, mask.size, spawned)
+            mask.flat[flat] = True
+
+        grid = np.where(mask, self.rng.integers(1, len(self.table), mask.shape), 0)
+        return render(self.table, grid)
+
+class AnimeSparkleField:
+    def __init__(self, width, height, rng):
+        self.width = width
+        self.height = height
+        self.table = glyph_table(ANIME_SPARKLE_CHARS)
+        self.rng = rng
+        self.scale = max(1, (width * height) // 45)
+        self.rows = np.zeros(0, dtype=np.intp)
+        self.cols = np.zeros(0, dtype=np.intp)
+        self.life = np.zeros(0, dtype=np.intp)
+        self.glyphs = np.zeros(0, dtype=np.intp)
+
+    def step(self):
+        room = 6 * self.scale - len(self.life)
+        if room > 0:
+            spawned = min(room, int((self.rng.random(self.scale) > 0.7).sum()))
+            self.rows = np.concatenate([self.rows, self.rng.integers(0, self.height, spawned)])
+            self.cols = np.concatenate([self.cols, self.rng.integers(0, self.width, spawned)])
+            self.life = np.concatenate([self.life, np.zeros(spawned, dtype=np.intp)])
+            self.glyphs = np.concatenate([self.glyphs, self.rng.integers(1, len(self.table), spawned)])
+
+        self.life += 1
+        keep = self.life < 15
+        self.rows, self.cols, self.life, self.glyphs = self.rows[keep], self.cols[keep], self.life[keep], self.glyphs[keep]
+
+        twinkle = self.life % 3 == 0
+        self.glyphs[twinkle] = self.rng.integers(1, len(self.table), int(twinkle.sum()))
+
+        grid = np.zeros((self.height, self.width), dtype=np.intp)
+        grid[self.rows, self.cols] = self.glyphs
+        return render(self.table, grid)
+
+class NumpyParticleEngine:
+    def __init__(self, width, height=3, seed=None):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.fields = {}
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        self.fields = {}
+
+    def field(self, name):
+        field = self.fields.get(name)
+        if field is None:
+            width, height = self.width, self.height
+            if self.seed is None:
+                rng = np.random.default_rng()
+            else:
+                rng = np.random.default_rng(stream_seed(self.seed, name))
+            if name == "japanese_rain":
+                field = RainField(width, height, JAPANESE_CHARS, 0.7, rng)
+            elif name == "regular_rain":
+                field = RainField(width, height, RAIN_CHARS, 0.8, rng)
+            elif name == "fire":
+                field = FireField(width, height, rng)
+            elif name == "snowflake":
+                field = SnowField(width, height, rng)
+            elif name == "sparkle":
+                field = SparkleField(width, height, rng)
+            else:
+                field = AnimeSparkleField(width, height, rng)
+            self.fields[name] = field
+        return field
+
+    def fire(self):
+        return self.field("fire").step()
+
+    def japanese_rain(self):
+        return self.field("japanese_rain").step()
+
+    def regular_rain(self):
+        return self.field("regular_rain").step()
+
+    def snowflake(self):
+        return self.field("snowflake").step()
+
+    def sparkle(self):
+        return self.field("sparkle").step()
+
+    def anime_sparkle(self):
+        return self.field("anime_sparkle").step()
@@ -0,0 +1,337 @@
+import math
+import threading
+import time
+from config import CHAR_LIMIT, DEFAULT_SPEED_MS, MIN_SPEED_MS, MAX_SPEED_MS, PLAYLIST_ITEM_S, PLAYLIST_PREWARM_S, PLAYLIST_TRANSITION, TRANSITION_FRAMES
+from scheduler import FrameScheduler
+from registry import spec_for_preset, clip_spec, STATIC_SPEC
+from clips import ClipPlayer
+
+BLANK = ("", "", "")
+MAX_ERRORS = 5
+
+class Program:
+    def __init__(self, preset_id, func, spec):
+        self.preset_id = preset_id
+        self.func = func
+        self.spec = spec
+        self.subscribed = False
+
+    @property
+    def name(self):
+        return getattr(self.func, '__name__', 'unknown')
+
+def static_program(preset_id, lines, spec=STATIC_SPEC):
+    lines = list(lines)
+
+    def static_display():
+        return list(lines)
+
+    return Program(preset_id, static_display, spec)
+
+def create_program(animations, preset_id, preset_data):
+    spec = spec_for_preset(preset_id, preset_data)
+    if spec is None:
+        raise ValueError(f"Unknown preset: {preset_id}")
+
+    if spec.kind == "static":
+        return static_program(preset_id, preset_data["lines"], spec)
+    if spec.kind == "clip":
+        clip = ClipPlayer(preset_data["path"])
+        return Program(preset_id, clip, clip_spec(clip.interval_ms))
+
+    func = animations.resolve(spec)
+    animations.prewarm(spec)
+    return Program(preset_id, func, spec)
+
+def clamp_speed(speed_ms):
+    # Settings files and control commands can hold anything; the scheduler needs a positive interval
+    speed_ms = float(speed_ms)
+    if not math.isfinite(speed_ms):
+        return DEFAULT_SPEED_MS
+    return min(max(speed_ms, MIN_SPEED_MS), MAX_SPEED_MS)
+
+def parse_playlist(text, default_duration=PLAYLIST_ITEM_S):
+    items = []
+    for entry in text.split(','):
+        preset_id, _, duration = entry.strip().partition(':')
+        if preset_id:
+            items.append((preset_id.strip(), float(duration) if duration.strip() else default_duration))
+    return items
+
+def wipe(old, new, progress, width=CHAR_LIMIT):
+    edge = int(round(width * progress))
+    return [n.ljust(width)[:edge] + o.ljust(width)[edge:] for o, n in zip(old, new)]
+
+class Playlist:
+    def __init__(self, items, transition=PLAYLIST_TRANSITION):
+        self.items = list(items)
+        self.transition = transition
+
+class Player:
+    def __init__(self, sensors, output, build=None, on_switch=None):
+        self.sensors = sensors
+        self.output = output
+        self.build = build
+        self.on_switch = on_switch
+        self.speed_ms = DEFAULT_SPEED_MS
+
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.requested = False
+        self.request = None
+        self.playlist = None
+        self.retime = False
+
+        # Owned by the render thread
+        self.program = None
+        self.scheduler = None
+        self.errors = 0
+        self.last_lines = None
+        self.transition = None
+        self.active_playlist = None
+        self.index = -1
+        self.item_end = 0.0
+        self.next_index = -1
+        self.next_program = None
+        self.switch_count = 0
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+
+        self.thread = threading.Thread(target=self.run, daemon=True, name="Player")
+        self.thread.start()
+
+    def stop(self, timeout=1.0):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+        self.thread = None
+
+    def play(self, factory):
+        # factory runs on the render thread and returns a Program; None blanks the display
+        with self.condition:
+            self.requested = True
+            self.request = factory
+            self.playlist = None
+            self.condition.notify()
+
+    def play_playlist(self, playlist):
+        with self.condition:
+            self.requested = True
+            self.request = None
+            self.playlist = playlist
+            self.condition.notify()
+
+    def set_speed(self, speed_ms):
+        speed_ms = clamp_speed(speed_ms)
+        with self.condition:
+            self.speed_ms = speed_ms
+            self.retime = True
+            self.condition.notify()
+
+    def get_stats(self):
+        scheduler = self.scheduler
+        if self.program is None or scheduler is None:
+            return None
+        return scheduler.get_stats()
+
+    def interrupted(self):
+        return self.requested or self.retime or not self.running
+
+    def sleep(self, delay):
+        # Slow presets (1 s static frames) must not hold up a playlist prewarm or switch
+        playlist_due = False
+        if self.active_playlist is not None:
+            due = self.item_end if self.next_program is not None else self.item_end - PLAYLIST_PREWARM_S
+            until_due = due - time.monotonic()
+            if until_due < delay:
+                delay = max(until_due, 0)
+                playlist_due = True
+
+        with self.condition:
+            return self.condition.wait_for(self.interrupted, delay) or playlist_due
+
+    def run(self):
+        try:
+            while True:
+                with self.condition:
+                    while self.running and not self.interrupted() and self.program is None:
+                        self.condition.wait()
+
+                    if not self.running:
+                        break
+
+                    requested, factory, playlist = self.requested, self.request, self.playlist
+                    retime = self.retime
+                    self.requested = self.retime = False
+                    self.request = None
+
+                # This thread lives as long as the app, one bad build or frame must not end it
+                try:
+                    self.step(requested, factory, playlist, retime)
+                except Exception as e:
+                    print(f"Player error: {e}")
+                    self.recover()
+        finally:
+            self.drop_next()
+            if self.program is not None:
+                self.release(self.program)
+                self.program = None
+            self.output(BLANK)
+
+    def step(self, requested, factory, playlist, retime):
+        if requested:
+            self.drop_next()
+            self.active_playlist = playlist
+            if playlist is not None:
+                self.index = -1
+                self.advance()
+            else:
+                self.switch(self.create(factory) if factory else None)
+            return
+
+        if retime and self.program is not None and self.program.spec.period is None:
+            self.scheduler.set_interval(self.speed_ms / 1000.0)
+
+        if self.program is None:
+            return
+
+        if self.active_playlist is not None:
+            self.tick_playlist()
+            # The next item may have failed to build and blanked the display
+            if self.program is None:
+                return
+
+        if self.scheduler.wait():
+            self.render()
+
+    def recover(self):
+        # Back to idle so later play() and play_playlist() requests are still served
+        self.active_playlist = None
+        try:
+            self.drop_next()
+            self.switch(None)
+        except Exception as e:
+            print(f"Error resetting player: {e}")
+            self.next_program = None
+            self.program = self.scheduler = None
+
+    def create(self, factory):
+        try:
+            return factory()
+        except Exception as e:
+            print(f"Error in animation setup: {e}")
+            return None
+
+    def subscribe(self, program):
+        if not program.subscribed:
+            self.sensors.subscribe(program.spec.sensors)
+            program.subscribed = True
+
+    def release(self, program):
+        if program.subscribed:
+            self.sensors.unsubscribe(program.spec.sensors)
+            program.subscribed = False
+        if hasattr(program.func, 'close'):
+            try:
+                program.func.close()
+            except Exception as e:
+                print(f"Error closing {program.name}: {e}")
+
+    def switch(self, program, transition="cut"):
+        old = self.program
+        scheduler = None
+        if program is not None:
+            self.subscribe(program)
+            scheduler = FrameScheduler(program.spec.period or self.speed_ms / 1000.0, self.sleep)
+
+        self.program, self.scheduler = program, scheduler
+        if old is not None and old is not program:
+            self.release(old)
+
+        self.errors = 0
+        self.transition = None
+        if program is None:
+            self.last_lines = None
+            self.output(BLANK)
+        elif transition == "wipe" and self.last_lines:
+            self.transition = (self.last_lines, 0)
+
+        self.switch_count += 1
+        if self.on_switch:
+            self.on_switch(program)
+
+    def render(self):
+        program = self.program
+        try:
+            lines = program.func()
+        except Exception as e:
+            lines = None
+            if self.errors == 0:
+                print(f"Animation error: {e}")
+
+        if not lines or not isinstance(lines, (list, tuple)) or len(lines) != 3:
+            self.errors += 1
+            if self.errors >= MAX_ERRORS:
+                print(f"Stopping {program.name} after {MAX_ERRORS} failed frames")
+                self.active_playlist = None
+                self.drop_next()
+                self.switch(None)
+            return
+        self.errors = 0
+
+        if self.transition is not None:
+            old, frame = self.transition
+            frame += 1
+            lines = wipe(old, lines, frame / TRANSITION_FRAMES)
+            self.transition = (old, frame) if frame < TRANSITION_FRAMES else None
+
+        self.last_lines = lines
+        self.output(lines)
+
+    def tick_playlist(self):
+        now = time.monotonic()
+        if self.next_program is None and now >= self.item_end - PLAYLIST_PREWARM_S:
+            self.prewarm_next()
+        if now >= self.item_end:
+            self.advance()
+
+    def prewarm_next(self):
+        # Built between frames ahead of its turn, so the cycle cache is filled and
+        # the sensors it needs are already sampling when it goes on screen
+        items = self.active_playlist.items
+        for step in range(1, len(items) + 1):
+            index = (self.index + step) % len(items)
+            preset_id = items[index][0]
+            program = self.create(lambda: self.build(preset_id))
+            if program is not None:
+                self.subscribe(program)
+                self.next_index, self.next_program = index, program
+                return
+
+        print("No playable presets in playlist")
+        self.active_playlist = None
+        self.switch(None)
+
+    def drop_next(self):
+        if self.next_program is not None:
+            self.release(self.next_program)
+            self.next_program = None
+
+    def advance(self):
+        if self.next_program is None:
+            self.prewarm_next()
+            if self.next_program is None:
+                return
+
+        program, self.index = self.next_program, self.next_index
+        self.next_program = None
+        self.item_end = time.monotonic() + self.active_playlist.items[self.index][1]
+        self.switch(program, self.active_playlist.transition)
@@ -0,0 +1,146 @@
+import glob
+import importlib
+import importlib.util
+import os
+import sys
+from config import PLUGINS_DIR, PLUGIN_ENTRY_POINT_GROUP
+from registry import AnimationSpec, register, get_preset, COST_LOW
+
+# A plugin is a module with a literal PRESETS dict, read with ast so discovery
+# never imports it:
+#
+#   PRESETS = {
+#       "starfield": {"name": "Starfield", "category": "Community", "factory": "create_starfield",
+#                     "period": None, "sensors": [], "cost": "low", "deterministic": True},
+#   }
+#
+#   def create_starfield(animations):
+#       rng = animations.rng("starfield")
+#       def starfield():
+#           return ["...", "...", "..."]
+#       return starfield
+#
+# The factory runs the first time the preset is selected and again on every
+# later selection, so each run starts from fresh state and a fresh seed.
+
+PLUGIN_KIND = "plugin"
+
+modules = {}
+paths = {}
+
+def read_presets(path):
+    import ast
+
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "PRESETS" for t in node.targets):
+            presets = ast.literal_eval(node.value)
+            if not isinstance(presets, dict):
+                raise ValueError("PRESETS must be a dict")
+            return presets
+    return {}
+
+def entry_point_modules():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        eps = eps.select(group=PLUGIN_ENTRY_POINT_GROUP)
+    else:
+        eps = eps.get(PLUGIN_ENTRY_POINT_GROUP, ())
+
+    found = []
+    for ep in eps:
+        module_name = ep.value.split(':')[0].strip()
+        # find_spec imports parent packages of a dotted name, but not the module itself
+        try:
+            module_spec = importlib.util.find_spec(module_name)
+        except Exception as e:
+            print(f"Plugin entry point {ep.name} not found: {e}")
+            continue
+        if module_spec is None or not module_spec.origin or not module_spec.origin.endswith('.py'):
+            print(f"Plugin entry point {ep.name} has no readable source, skipping")
+            continue
+        found.append((module_name, module_spec.origin))
+    return found
+
+def directory_modules(plugins_dir=PLUGINS_DIR):
+    found = []
+    for filepath in sorted(glob.glob(os.path.join(plugins_dir, "*.py"))):
+        name = os.path.splitext(os.path.basename(filepath))[0]
+        if not name.startswith('_'):
+            found.append((f"nova_plugins.{name}", filepath))
+    return found
+
+def make_spec(module_name, preset_id, meta):
+    return AnimationSpec(
+        meta["factory"],
+        preset_id=preset_id,
+        name=meta.get("name", preset_id.replace('_', ' ').title()),
+        category=meta.get("category", "Plugins"),
+        kind=PLUGIN_KIND,
+        period=meta.get("period"),
+        deterministic=bool(meta.get("deterministic", False)),
+        sensors=meta.get("sensors", ()),
+        cost=meta.get("cost", COST_LOW),
+        module=module_name
+    )
+
+def discover_plugins(plugins_dir=PLUGINS_DIR):
+    specs = []
+    for module_name, path in directory_modules(plugins_dir) + entry_point_modules():
+        try:
+            presets = read_presets(path)
+        except Exception as e:
+            print(f"Skipping plugin {path}: {e}")
+            continue
+        paths[module_name] = path
+
+        for preset_id, meta in presets.items():
+            try:
+                specs.append(make_spec(module_name, preset_id, meta))
+            except Exception as e:
+                print(f"Skipping plugin preset {preset_id} in {path}: {e}")
+    return specs
+
+def register_plugins(plugins_dir=PLUGINS_DIR):
+    # Built-ins register on import; without them here a plugin could take over e.g. "clock"
+    import animations
+
+    count = 0
+    for spec in discover_plugins(plugins_dir):
+        if get_preset(spec.preset_id) is not None:
+            print(f"Plugin preset {spec.preset_id} clashes with an existing preset, skipping")
+            continue
+        register(spec)
+        count += 1
+    return count
+
+def load_module(module_name):
+    loaded = modules.get(module_name)
+    if loaded is not None:
+        return loaded
+
+    if module_name.startswith("nova_plugins."):
+        module_spec = importlib.util.spec_from_file_location(module_name, paths[module_name])
+        loaded = importlib.util.module_from_spec(module_spec)
+        sys.modules[module_name] = loaded
+        try:
+            module_spec.loader.exec_module(loaded)
+        except Exception:
+            del sys.modules[module_name]
+            raise
+    else:
+        loaded = importlib.import_module(module_name)
+
+    modules[module_name] = loaded
+    return loaded
+
+def create_plugin_animation(spec, animations):
+    factory = getattr(load_module(spec.module), spec.func)
+    return factory(animations)
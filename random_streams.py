@@ -0,0 +1,26 @@
+import random
+import zlib
+
+def new_seed():
+    return random.randrange(2 ** 32)
+
+def stream_seed(seed, name):
+    # Stable across runs, unlike hash(), so a seed always maps to the same streams
+    return (seed << 32) ^ zlib.crc32(name.encode('utf-8'))
+
+class RandomStreams:
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        self.seed = seed if seed is not None else new_seed()
+        self.streams = {}
+
+    def rewind(self):
+        self.streams = {}
+
+    def get(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = self.streams[name] = random.Random(stream_seed(self.seed, name))
+        return stream
@@ -0,0 +1,107 @@
+COST_LOW = "low"
+COST_MEDIUM = "medium"
+COST_HIGH = "high"
+COST_IO = "io"
+
+COST_ORDER = [COST_LOW, COST_MEDIUM, COST_HIGH, COST_IO]
+
+CATEGORY_ORDER = ["Animations", "Gaming", "Anime", "System", "Mixes"]
+
+class AnimationSpec:
+    def __init__(self, func, preset_id=None, name=None, category=None, kind="animation",
+                 period=None, deterministic=False, cycle=None, sensors=(), cost=COST_LOW, module=None, layers=()):
+        self.func = func
+        self.preset_id = preset_id
+        self.name = name
+        self.category = category
+        self.kind = kind
+        self.period = period
+        self.deterministic = deterministic
+        self.cycle = cycle
+        self.sensors = tuple(sensors)
+        self.cost = cost
+        self.module = module
+        self.layers = tuple(layers)
+
+    @property
+    def key(self):
+        if self.module is None:
+            return self.func
+        return f"{self.module}:{self.func}"
+
+    @property
+    def cacheable(self):
+        return self.cycle is not None
+
+    def preset_data(self):
+        return {"name": self.name, "type": self.kind, "func": self.func}
+
+    def __repr__(self):
+        return f"AnimationSpec({self.func!r}, preset_id={self.preset_id!r})"
+
+SPECS = {}
+PRESETS = {}
+
+STATIC_SPEC = AnimationSpec("static_display", kind="static", period=1.0, deterministic=True)
+CUSTOM_SPEC = AnimationSpec("custom_display", kind="static", period=1.0, deterministic=True)
+CLIP_SPEC = AnimationSpec("clip_player", kind="clip", deterministic=True)
+
+def clip_spec(interval_ms):
+    # Clips replay at the interval they were recorded for, not the speed slider
+    return AnimationSpec("clip_player", kind="clip", period=interval_ms / 1000.0 if interval_ms else None,
+                         deterministic=True)
+
+def register(spec):
+    SPECS[spec.key] = spec
+    if spec.preset_id:
+        PRESETS[spec.preset_id] = spec
+    return spec
+
+def animation(preset_id=None, name=None, category=None, **metadata):
+    def decorator(func):
+        register(AnimationSpec(func.__name__, preset_id, name, category, **metadata))
+        return func
+    return decorator
+
+def composite(preset_id, name, layers, category="Mixes"):
+    specs = [SPECS[layer["func"]] for layer in layers]
+    sensors = []
+    for spec in specs:
+        sensors.extend(sensor for sensor in spec.sensors if sensor not in sensors)
+    return register(AnimationSpec(
+        f"composite:{preset_id}",
+        preset_id=preset_id,
+        name=name,
+        category=category,
+        kind="composite",
+        deterministic=all(spec.deterministic for spec in specs),
+        sensors=sensors,
+        cost=max((spec.cost for spec in specs), key=COST_ORDER.index),
+        layers=layers
+    ))
+
+def get_spec(func_name):
+    return SPECS.get(func_name)
+
+def get_preset(preset_id):
+    return PRESETS.get(preset_id)
+
+def spec_for_preset(preset_id, preset_data):
+    # ASCII art and clip ids come from file names and may shadow a registered id
+    preset_type = preset_data.get("type")
+    if preset_type == "static":
+        return STATIC_SPEC
+    if preset_type == "clip":
+        return CLIP_SPEC
+
+    spec = PRESETS.get(preset_id)
+    if spec is not None:
+        return spec
+    return SPECS.get(preset_data.get("func"))
+
+def presets_by_category():
+    # Buttons appear in registration order, i.e. the order the decorators sit in animations.py
+    categories = {category: {} for category in CATEGORY_ORDER}
+    for preset_id, spec in PRESETS.items():
+        categories.setdefault(spec.category, {})[preset_id] = spec.preset_data()
+    return {category: presets for category, presets in categories.items() if presets}
@@ -0,0 +1,61 @@
+import time
+from collections import deque
+from config import FRAME_STATS_WINDOW
+
+def check_interval(interval):
+    if not interval > 0:
+        raise ValueError(f"Frame interval must be positive, got {interval}")
+    return interval
+
+class FrameScheduler:
+    def __init__(self, interval, sleep=time.sleep):
+        self.interval = check_interval(interval)
+        self.sleep = sleep
+        self.next_deadline = None
+        self.skipped_count = 0
+        self.tick_times = deque(maxlen=FRAME_STATS_WINDOW)
+
+    def wait(self):
+        now = time.monotonic()
+        if self.next_deadline is None:
+            self.next_deadline = now
+
+        delay = self.next_deadline - now
+        if delay > 0:
+            # An interrupted sleep leaves the deadline alone so the caller can re-plan
+            if self.sleep(delay):
+                return False
+            now = time.monotonic()
+        elif -delay >= self.interval:
+            # Fell behind: drop the missed ticks instead of bursting to catch up
+            missed = int(-delay // self.interval)
+            self.skipped_count += missed
+            self.next_deadline += missed * self.interval
+
+        self.tick_times.append(now)
+        self.next_deadline += self.interval
+        return True
+
+    def set_interval(self, interval):
+        check_interval(interval)
+        if self.next_deadline is not None:
+            self.next_deadline += interval - self.interval
+        self.interval = interval
+
+    def get_stats(self):
+        ticks = list(self.tick_times)
+        if len(ticks) < 2:
+            return {"fps": 0.0, "jitter_ms": 0.0, "skipped": self.skipped_count}
+
+        periods = [b - a for a, b in zip(ticks, ticks[1:])]
+        elapsed = ticks[-1] - ticks[0]
+        fps = len(periods) / elapsed if elapsed > 0 else 0.0
+
+        mean = sum(periods) / len(periods)
+        variance = sum((p - mean) ** 2 for p in periods) / len(periods)
+
+        return {
+            "fps": fps,
+            "jitter_ms": variance ** 0.5 * 1000,
+            "skipped": self.skipped_count
+        }
@@ -0,0 +1,144 @@
+import threading
+import time
+from config import CPU_SMOOTHING
+
+from lazy import installed, load
+
+HAS_PSUTIL = installed("psutil")
+
+class SensorHub:
+    def __init__(self):
+        self.sources = {}
+        self.snapshot = {}
+        self.subscribers = {}
+        self.released = set()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.running = False
+
+    def add_source(self, name, sampler, period, release=None):
+        # release runs on the sampling thread once the last subscriber of a source leaves
+        with self.lock:
+            self.sources[name] = {"sampler": sampler, "period": period, "next": 0, "release": release}
+
+    def subscribe(self, names):
+        with self.lock:
+            for name in names:
+                if name in self.sources:
+                    self.subscribers[name] = self.subscribers.get(name, 0) + 1
+                    self.sources[name]["next"] = 0
+                    self.released.discard(name)
+
+            if self.subscribers and not self.running:
+                self.running = True
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.run, daemon=True, name="SensorHub")
+                    self.thread.start()
+
+        self.wakeup.set()
+
+    def unsubscribe(self, names):
+        with self.lock:
+            for name in names:
+                count = self.subscribers.get(name, 0) - 1
+                if count > 0:
+                    self.subscribers[name] = count
+                elif self.subscribers.pop(name, None) is not None and self.sources[name]["release"]:
+                    self.released.add(name)
+
+            if not self.subscribers:
+                self.running = False
+
+        self.wakeup.set()
+
+    def get(self, name, max_age=None):
+        entry = self.snapshot.get(name)
+        if entry is None:
+            return None
+
+        value, timestamp = entry
+        if max_age is not None and time.monotonic() - timestamp > max_age:
+            return None
+        return value
+
+    def age(self, name):
+        entry = self.snapshot.get(name)
+        if entry is None:
+            return None
+        return time.monotonic() - entry[1]
+
+    def run(self):
+        while True:
+            self.wakeup.clear()
+            with self.lock:
+                released = [self.sources[name]["release"] for name in self.released]
+                self.released.clear()
+                if not self.running and not released:
+                    self.thread = None
+                    return
+                now = time.monotonic()
+                due = []
+                next_wake = now + 1.0 if self.running else now
+                for name in self.subscribers:
+                    source = self.sources[name]
+                    if source["next"] <= now:
+                        due.append((name, source))
+                        source["next"] = now + source["period"]
+                    next_wake = min(next_wake, source["next"])
+
+            for release in released:
+                try:
+                    release()
+                except Exception as e:
+                    print(f"Error releasing sensor: {e}")
+
+            for name, source in due:
+                try:
+                    value = source["sampler"]()
+                except Exception:
+                    continue
+                # Whole-tuple swap so readers never see a value without its timestamp
+                self.snapshot[name] = (value, time.monotonic())
+
+            self.wakeup.wait(max(0.0, next_wake - time.monotonic()))
+
+def cpu_total_time(times):
+    # Guest time is already counted in user/nice on Linux
+    return sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+
+def cpu_busy_time(times):
+    return cpu_total_time(times) - times.idle - getattr(times, 'iowait', 0)
+
+class CpuSampler:
+    def __init__(self, smoothing=CPU_SMOOTHING):
+        self.smoothing = smoothing
+        self.previous = None
+        self.per_core = []
+        self.total = None
+
+    def sample(self):
+        if not HAS_PSUTIL:
+            return None
+
+        current = load("psutil").cpu_times(percpu=True)
+        previous = self.previous or [None] * len(current)
+        self.previous = current
+
+        raw = []
+        for before, after in zip(previous, current):
+            busy = cpu_busy_time(after)
+            total = cpu_total_time(after)
+            if before is not None:
+                busy -= cpu_busy_time(before)
+                total -= cpu_total_time(before)
+            raw.append(min(100.0, max(0.0, busy / total * 100)) if total > 0 else 0.0)
+
+        if len(self.per_core) != len(raw):
+            self.per_core = raw
+        else:
+            alpha = self.smoothing
+            self.per_core = [alpha * new + (1 - alpha) * old for new, old in zip(raw, self.per_core)]
+
+        self.total = sum(self.per_core) / len(self.per_core) if self.per_core else 0.0
+        return self.total
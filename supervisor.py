@@ -0,0 +1,119 @@
+import threading
+from config import SEND_FAILURE_LIMIT, RECONNECT_MIN_S, RECONNECT_MAX_S
+from controller import core_props_path, read_server_url
+from watcher import CorePropsWatcher
+
+class ConnectionSupervisor:
+    def __init__(self, controller, on_change=None, failure_limit=SEND_FAILURE_LIMIT,
+                 backoff_min=RECONNECT_MIN_S, backoff_max=RECONNECT_MAX_S):
+        self.controller = controller
+        self.on_change = on_change
+        self.failure_limit = failure_limit
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.needs_setup = True
+        self.failures = 0
+        self.attempts = 0
+        self.reconnects = 0
+        self.watcher = CorePropsWatcher(self.on_address_change)
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+
+        self.thread = threading.Thread(target=self.run, daemon=True, name="ConnectionSupervisor")
+        self.thread.start()
+        self.watcher.start()
+
+    def stop(self, timeout=3.0):
+        self.watcher.stop()
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+        self.thread = None
+
+    def request_reconnect(self):
+        with self.condition:
+            self.needs_setup = True
+            self.condition.notify()
+
+    def on_address_change(self, url):
+        # Engine restarted on a new port: swap the endpoint and pool, the player keeps rendering
+        if self.controller.set_server_url(url):
+            print(f"SteelSeries Engine moved to {url}")
+            with self.condition:
+                self.controller.is_connected = False
+                self.needs_setup = True
+                self.condition.notify()
+            self.notify(False)
+
+    def report(self, ok):
+        # Fed from FrameSender results; a few failed sends in a row mean GameSense went away
+        with self.condition:
+            if ok:
+                self.failures = 0
+                return
+            if not self.controller.is_connected or self.needs_setup:
+                return
+
+            self.failures += 1
+            if self.failures < self.failure_limit:
+                return
+
+            print(f"{self.failures} frames failed in a row, reconnecting")
+            self.controller.is_connected = False
+            self.needs_setup = True
+            self.condition.notify()
+
+        self.notify(False)
+
+    def notify(self, connected):
+        if self.on_change:
+            try:
+                self.on_change(connected)
+            except Exception as e:
+                print(f"Connection callback failed: {e}")
+
+    def run(self):
+        backoff = self.backoff_min
+        while True:
+            with self.condition:
+                while self.running and not self.needs_setup:
+                    self.condition.wait()
+                if not self.running:
+                    break
+                self.needs_setup = False
+                self.failures = 0
+
+            self.attempts += 1
+            # A missing or half-written coreProps.json keeps the address we already have
+            url = read_server_url(core_props_path()) or self.controller.server_url
+            if self.controller.set_server_url(url):
+                print(f"SteelSeries Engine moved to {self.controller.server_url}")
+
+            try:
+                connected = self.controller.setup()
+            except Exception:
+                connected = None
+
+            if connected:
+                if self.attempts > 1:
+                    self.reconnects += 1
+                backoff = self.backoff_min
+                self.notify(True)
+                continue
+
+            self.notify(False)
+            with self.condition:
+                # Exponential backoff, cut short by stop(), a reconnect request or a new address
+                self.condition.wait_for(lambda: not self.running or self.needs_setup, backoff)
+                self.needs_setup = True
+            backoff = min(backoff * 2, self.backoff_max)
@@ -0,0 +1,350 @@
+import sys
+import threading
+import time
+from config import TEMP_MAX_FAILURES, TEMP_REPROBE_S
+from hwinfo import HWiNFOReader, READING_TEMPERATURE
+
+from lazy import installed, load
+
+try:
+    import struct
+    import mmap
+    HAS_MMAP = True
+except ImportError:
+    HAS_MMAP = False
+
+# pythoncom and wmi cost well over 100 ms to import, so they load on first probe
+HAS_PSUTIL = installed("psutil")
+HAS_WMI = installed("wmi") and installed("pythoncom")
+
+CPU_KEYWORDS = ["CPU", "CORE", "PROCESSOR"]
+
+def valid_temperature(temp):
+    return temp is not None and 0 < temp < 150
+
+def ensure_com_initialized():
+    current_thread = threading.current_thread()
+    if not hasattr(current_thread, '_com_initialized'):
+        load("pythoncom").CoInitialize()
+        current_thread._com_initialized = True
+
+class OpenHardwareMonitorSource:
+    name = "ohm_wmi"
+    # COM objects belong to the thread that created them
+    thread_bound = True
+
+    def __init__(self):
+        self.connection = None
+        self.query = None
+
+    def available(self):
+        return HAS_WMI and sys.platform == "win32"
+
+    def probe(self):
+        ensure_com_initialized()
+        self.connection = load("wmi").WMI(namespace="root\\OpenHardwareMonitor")
+
+        identifiers = []
+        for sensor in self.connection.Sensor():
+            if sensor.SensorType == "Temperature":
+                if any(keyword in sensor.Name.upper() for keyword in CPU_KEYWORDS):
+                    identifiers.append(sensor.Identifier)
+
+        if not identifiers:
+            return False
+
+        where = " OR ".join(f"Identifier='{identifier}'" for identifier in identifiers)
+        self.query = f"SELECT Value FROM Sensor WHERE {where}"
+        return True
+
+    def read(self):
+        cpu_temps = []
+        for sensor in self.connection.query(self.query):
+            temp = float(sensor.Value)
+            if valid_temperature(temp):
+                cpu_temps.append(temp)
+
+        if cpu_temps:
+            return sum(cpu_temps) / len(cpu_temps)
+        return None
+
+    def close(self):
+        self.connection = None
+        self.query = None
+
+class AcpiThermalZoneSource:
+    name = "acpi_wmi"
+    thread_bound = True
+
+    def __init__(self):
+        self.connection = None
+        self.zone_index = None
+
+    def available(self):
+        return HAS_WMI and sys.platform == "win32"
+
+    def probe(self):
+        ensure_com_initialized()
+        self.connection = load("wmi").WMI(namespace="root\\wmi")
+
+        for index, thermal in enumerate(self.connection.MSAcpi_ThermalZoneTemperature()):
+            if valid_temperature(thermal.CurrentTemperature / 10.0 - 273.15):
+                self.zone_index = index
+                return True
+        return False
+
+    def read(self):
+        zones = self.connection.MSAcpi_ThermalZoneTemperature(["CurrentTemperature"])
+        if self.zone_index < len(zones):
+            temp = zones[self.zone_index].CurrentTemperature / 10.0 - 273.15
+            if valid_temperature(temp):
+                return temp
+        return None
+
+    def close(self):
+        self.connection = None
+        self.zone_index = None
+
+class PsutilSensorsSource:
+    name = "psutil"
+    thread_bound = False
+
+    def __init__(self):
+        self.sensor_key = None
+
+    def available(self):
+        return HAS_PSUTIL and hasattr(load("psutil"), "sensors_temperatures")
+
+    def probe(self):
+        temps = load("psutil").sensors_temperatures()
+        for name, entries in (temps or {}).items():
+            if any(keyword in name.upper() for keyword in CPU_KEYWORDS):
+                for index, entry in enumerate(entries):
+                    if valid_temperature(entry.current):
+                        self.sensor_key = (name, index)
+                        return True
+        return False
+
+    def read(self):
+        name, index = self.sensor_key
+        entries = load("psutil").sensors_temperatures().get(name, [])
+        if index < len(entries) and valid_temperature(entries[index].current):
+            return entries[index].current
+        return None
+
+    def close(self):
+        self.sensor_key = None
+
+class SysfsThermalSource:
+    name = "sysfs"
+    thread_bound = False
+
+    def __init__(self):
+        self.path = None
+
+    def available(self):
+        return sys.platform.startswith("linux")
+
+    def probe(self):
+        for i in range(10):
+            path = f"/sys/class/thermal/thermal_zone{i}/temp"
+            try:
+                with open(path, 'r') as f:
+                    if valid_temperature(int(f.read().strip()) / 1000.0):
+                        self.path = path
+                        return True
+            except (OSError, ValueError):
+                continue
+        return False
+
+    def read(self):
+        with open(self.path, 'r') as f:
+            temp = int(f.read().strip()) / 1000.0
+        return temp if valid_temperature(temp) else None
+
+    def close(self):
+        self.path = None
+
+class CoreTempSource:
+    name = "coretemp"
+    thread_bound = False
+    temp_offset = 160
+
+    def __init__(self):
+        self.mm = None
+
+    def available(self):
+        return sys.platform == "win32" and HAS_MMAP
+
+    def probe(self):
+        self.mm = mmap.mmap(-1, 1024, tagname="CoreTempMappingObject", access=mmap.ACCESS_READ)
+        cpu_count = struct.unpack_from('I', self.mm, 0)[0]
+        return 0 < cpu_count < 64
+
+    def read(self):
+        temp = struct.unpack_from('f', self.mm, self.temp_offset)[0]
+        return temp if valid_temperature(temp) else None
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+class HWiNFOSource:
+    name = "hwinfo"
+    thread_bound = False
+
+    def __init__(self):
+        self.reader = None
+        self.reading = None
+
+    def available(self):
+        return sys.platform == "win32" and HAS_MMAP
+
+    def probe(self):
+        self.reader = HWiNFOReader()
+        self.reader.open()
+        self.reading = (
+            self.reader.find(READING_TEMPERATURE, "CPU", "PACKAGE")
+            or self.reader.find(READING_TEMPERATURE, "CPU")
+            or self.reader.find(READING_TEMPERATURE, "CORE")
+        )
+        return self.reading is not None
+
+    def read(self):
+        if self.reader.is_stale():
+            return None
+        temp = self.reader.value(self.reading)
+        return temp if valid_temperature(temp) else None
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        self.reading = None
+
+def default_sources():
+    return [
+        OpenHardwareMonitorSource(),
+        AcpiThermalZoneSource(),
+        PsutilSensorsSource(),
+        SysfsThermalSource(),
+        CoreTempSource(),
+        HWiNFOSource(),
+    ]
+
+class TemperatureReader:
+    def __init__(self, sources=None, max_failures=TEMP_MAX_FAILURES):
+        self.sources = sources if sources is not None else default_sources()
+        self.max_failures = max_failures
+        self.active = None
+        self.active_thread = None
+        self.failures = 0
+        self.next_probe = 0
+        self.pending_order = None
+
+    def set_order(self, names):
+        # Applied on the reading thread so a source is never closed while in use
+        self.pending_order = list(names)
+
+    def apply_order(self, names):
+        rank = {name: i for i, name in enumerate(names)}
+        self.sources.sort(key=lambda source: rank.get(source.name, len(rank)))
+        self.next_probe = 0
+        if self.active is not None and self.active is not self.sources[0]:
+            self.release()
+
+    def read(self):
+        if self.pending_order is not None:
+            names, self.pending_order = self.pending_order, None
+            self.apply_order(names)
+
+        active = self.active
+        if active is not None and active.thread_bound and self.active_thread != threading.get_ident():
+            self.release()
+            active = None
+
+        if active is not None:
+            try:
+                temp = active.read()
+            except Exception:
+                temp = None
+
+            if temp is not None:
+                self.failures = 0
+                return temp
+
+            self.failures += 1
+            if self.failures < self.max_failures:
+                return None
+            self.release()
+
+        if time.monotonic() < self.next_probe:
+            return None
+        return self.probe()
+
+    def probe(self):
+        for source in self.sources:
+            if not source.available():
+                continue
+
+            try:
+                if source.probe():
+                    temp = source.read()
+                    if temp is not None:
+                        self.active = source
+                        self.active_thread = threading.get_ident()
+                        self.failures = 0
+                        return temp
+            except Exception:
+                pass
+            source.close()
+
+        self.next_probe = time.monotonic() + TEMP_REPROBE_S
+        return None
+
+    def release(self):
+        if self.active is not None:
+            self.active.close()
+        self.active = None
+        self.active_thread = None
+        self.failures = 0
+
+def discover_sources():
+    results = []
+    for source in default_sources():
+        result = {"name": source.name, "available": False, "latency_ms": None, "temperature": None}
+        if source.available():
+            start = time.perf_counter()
+            try:
+                if source.probe():
+                    result["temperature"] = source.read()
+            except Exception:
+                pass
+            result["latency_ms"] = (time.perf_counter() - start) * 1000
+            result["available"] = result["temperature"] is not None
+            try:
+                source.close()
+            except Exception:
+                pass
+        results.append(result)
+
+    results.sort(key=lambda r: (not r["available"], r["latency_ms"] if r["latency_ms"] is not None else float('inf')))
+    return results
+
+def format_discovery(results):
+    lines = ["Temperature sources:", f"  {'#':<3}{'Source':<11}{'Status':<13}{'Latency':>10}  Reading"]
+    rank = 0
+    for result in results:
+        if result["available"]:
+            rank += 1
+            position = str(rank)
+            status = "ok"
+        else:
+            position = "-"
+            status = "failed" if result["latency_ms"] is not None else "unavailable"
+
+        latency = f"{result['latency_ms']:.1f} ms" if result["latency_ms"] is not None else ""
+        reading = f"{result['temperature']:.1f}°C" if result["temperature"] is not None else ""
+        lines.append(f"  {position:<3}{result['name']:<11}{status:<13}{latency:>10}  {reading}")
+    return "\n".join(lines)
@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Minimal stand-in for SteelSeries Engine's GameSense HTTP API
+
+class GameSenseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle on, a keep-alive client
+    # waits out the delayed ACK (~40 ms) for every body
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"null")
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        stub.record(self.path, payload)
+
+        body = b"{}"
+        self.send_response(stub.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class GameSenseStub:
+    def __init__(self, latency=0.0, status=200):
+        self.latency = latency
+        self.status = status
+        self.requests = []
+        self.lock = threading.Lock()
+        self.received = threading.Condition(self.lock)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), GameSenseHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address
+        return f"{host}:{port}"
+
+    @property
+    def url(self):
+        return f"http://{self.address}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def record(self, path, payload):
+        with self.lock:
+            self.requests.append((path, payload, time.monotonic()))
+            self.received.notify_all()
+
+    def paths(self):
+        with self.lock:
+            return [path for path, _, _ in self.requests]
+
+    def count(self, path):
+        return self.paths().count(path)
+
+    def wait_for(self, path, count=1, timeout=5.0):
+        with self.lock:
+            return self.received.wait_for(
+                lambda: sum(1 for p, _, _ in self.requests if p == path) >= count, timeout)
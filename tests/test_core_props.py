@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+import controller
+import supervisor
+import watcher
+from controller import OLEDController
+from frame_sender import FrameSender
+from player import Player, Program
+from registry import AnimationSpec
+from sensors import SensorHub
+from gamesense import GameSenseStub
+
+def write_props(path, address):
+    # Engine rewrites the file; write-then-rename so readers never see it half done
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"address": address}))
+    tmp.replace(path)
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+@pytest.fixture
+def props(tmp_path, monkeypatch):
+    path = tmp_path / "SteelSeries Engine 3" / "coreProps.json"
+    path.parent.mkdir()
+    for module in (controller, supervisor, watcher):
+        monkeypatch.setattr(module, "core_props_path", lambda: str(path))
+    return path
+
+@pytest.fixture
+def stubs():
+    started = [GameSenseStub().start(), GameSenseStub().start()]
+    yield started
+    for stub in started:
+        stub.stop()
+
+def start_watcher(path, interval=0.05):
+    seen = []
+    changed = threading.Event()
+
+    def on_change(url):
+        seen.append(url)
+        changed.set()
+
+    props_watcher = watcher.CorePropsWatcher(on_change, path=str(path), interval=interval)
+    props_watcher.start()
+    return props_watcher, seen, changed
+
+def test_read_server_url(props):
+    assert controller.read_server_url(str(props)) is None
+    props.write_text('{"addr')
+    assert controller.read_server_url(str(props)) is None
+    write_props(props, "127.0.0.1:51234")
+    assert controller.read_server_url(str(props)) == "http://127.0.0.1:51234"
+    assert controller.get_server_url() == "http://127.0.0.1:51234"
+
+@pytest.mark.parametrize("mode", ["inotify", "poll"])
+def test_watcher_reports_new_address(props, monkeypatch, mode):
+    if mode == "poll":
+        monkeypatch.setattr(watcher, "open_inotify", lambda directory: (None, "forced"))
+    elif watcher.open_inotify(str(props.parent))[0] is None:
+        pytest.skip("inotify not available")
+
+    write_props(props, "127.0.0.1:1000")
+    props_watcher, seen, changed = start_watcher(props)
+    try:
+        assert wait_until(lambda: props_watcher.mode == mode)
+        # A half-written file is not an address change
+        props.write_text('{"address": "127.0')
+        time.sleep(0.2)
+        assert seen == []
+
+        write_props(props, "127.0.0.1:2000")
+        assert changed.wait(2.0)
+        assert seen == ["http://127.0.0.1:2000"]
+    finally:
+        props_watcher.stop()
+    assert props_watcher.thread is None
+
+def test_watcher_waits_for_missing_directory(tmp_path):
+    path = tmp_path / "later" / "coreProps.json"
+    props_watcher, seen, changed = start_watcher(path)
+    try:
+        assert wait_until(lambda: props_watcher.mode == "poll")
+        path.parent.mkdir()
+        write_props(path, "127.0.0.1:3000")
+        assert changed.wait(2.0)
+        assert seen == ["http://127.0.0.1:3000"]
+    finally:
+        props_watcher.stop()
+
+def test_watcher_stops_within_join_timeout(props):
+    write_props(props, "127.0.0.1:1000")
+    props_watcher, _, _ = start_watcher(props, interval=5.0)
+    time.sleep(0.1)
+    started = time.monotonic()
+    props_watcher.stop()
+    assert time.monotonic() - started < 1.0
+
+def test_engine_restart_hot_swaps_without_stopping_the_animation(props, stubs):
+    old, new = stubs
+    write_props(props, old.address)
+
+    oled = OLEDController()
+    connection = supervisor.ConnectionSupervisor(oled, backoff_min=0.05, backoff_max=0.2)
+    sender = FrameSender(oled, connection.report)
+
+    counter = iter(range(10 ** 6))
+    def counting():
+        # Every frame differs so none is skipped as a duplicate
+        return [str(next(counter)), "", ""]
+    program = Program("counting", counting, AnimationSpec("counting", period=0.02))
+
+    player = Player(SensorHub(), lambda lines: sender.submit(*lines))
+    sender.start()
+    player.start()
+    connection.start()
+    try:
+        assert old.wait_for("/bind_game_event")
+        player.play(lambda: program)
+        assert old.wait_for("/game_event", 5)
+        switches = player.switch_count
+
+        write_props(props, new.address)
+        assert new.wait_for("/bind_game_event")
+        assert new.wait_for("/game_event", 5)
+        assert oled.server_url == new.url
+
+        # Same program kept rendering on the same player thread throughout
+        assert player.thread.is_alive()
+        assert player.program is program
+        assert player.switch_count == switches
+
+        sent_to_old = old.count("/game_event")
+        assert new.wait_for("/game_event", 10)
+        assert old.count("/game_event") == sent_to_old
+    finally:
+        connection.stop()
+        player.stop()
+        sender.stop()
+
+def test_unreadable_props_keep_current_address(props, stubs):
+    old, _ = stubs
+    write_props(props, old.address)
+    oled = OLEDController()
+    connection = supervisor.ConnectionSupervisor(oled, backoff_min=0.05, backoff_max=0.2)
+    connection.start()
+    try:
+        assert old.wait_for("/bind_game_event")
+        props.write_text('{"address": ')
+        connection.request_reconnect()
+        assert old.wait_for("/bind_game_event", 2)
+        assert oled.server_url == old.url
+    finally:
+        connection.stop()
@@ -0,0 +1,50 @@
+import statistics
+import sys
+import tracemalloc
+
+import pytest
+
+from animations import AnimationFunctions
+from config import CHAR_LIMIT
+
+ANIMATIONS = [
+    "japanese_rain_animation", "sparkle_animation", "fire_animation", "glitch_animation",
+    "binary_stream_animation", "snake_game_animation", "regular_rain_animation", "snowflake_animation",
+    "anime_sparkle_animation", "cat_walking_animation", "mouse_running_animation", "typing_animation",
+    "radar_animation", "wave_animation", "rainbow_animation", "pulse_animation", "loading_bar_animation",
+]
+WARMUP_FRAMES = 50
+FRAMES = 200
+# FrameBuffer.to_lines joins one row slice at a time; anything per-frame on top of that
+# (a rebuilt glyph list, a temporary grid) shows up as overhead
+ROW_SLICE_BYTES = sys.getsizeof([None] * CHAR_LIMIT)
+SLACK_BYTES = 256
+
+def frame_size(lines):
+    # The three strings and the list handed to the player are new every frame by design
+    return sys.getsizeof(lines) + sum(sys.getsizeof(line) for line in lines)
+
+@pytest.fixture(scope="module")
+def animations():
+    animations = AnimationFunctions(42)
+    animations.particles = None
+    return animations
+
+@pytest.mark.parametrize("name", ANIMATIONS)
+def test_frame_allocates_little_beyond_its_output(animations, name):
+    func = getattr(animations, name)
+    for _ in range(WARMUP_FRAMES):
+        func()
+
+    overheads = []
+    tracemalloc.start()
+    try:
+        for _ in range(FRAMES):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            lines = func()
+            overheads.append(tracemalloc.get_traced_memory()[1] - before - frame_size(lines))
+    finally:
+        tracemalloc.stop()
+
+    assert statistics.median(overheads) <= ROW_SLICE_BYTES + SLACK_BYTES
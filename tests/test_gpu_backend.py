@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+import animations as animations_module
+import gpu
+from animations import AnimationFunctions
+from gpu import create_gpu_backend, FakeGpuBackend, NullBackend
+from registry import get_preset
+
+def wait_for_sample(hub, name, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while hub.get(name) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return hub.get(name)
+
+@pytest.fixture
+def backends():
+    return []
+
+@pytest.fixture
+def animations(backends):
+    def fake_factory():
+        backend = FakeGpuBackend(load=0.42, temperature=67.0)
+        backends.append(backend)
+        return backend
+
+    animations = AnimationFunctions(42, gpu_factory=fake_factory)
+    yield animations
+    animations.close()
+
+def test_forced_modes():
+    assert isinstance(create_gpu_backend(mode="fake"), FakeGpuBackend)
+    assert isinstance(create_gpu_backend(mode="none"), NullBackend)
+
+def test_forced_mode_falls_back_to_null_when_unavailable(monkeypatch):
+    def broken():
+        raise RuntimeError("no GPU")
+    monkeypatch.setitem(gpu.BACKENDS, "nvml", broken)
+    assert isinstance(create_gpu_backend(mode="nvml"), NullBackend)
+
+@pytest.mark.skipif(not animations_module.HAS_PSUTIL, reason="psutil not installed")
+def test_gpu_cpu_ram_on_fake_backend(animations):
+    sensors = get_preset("gpu_cpu_ram").sensors
+    animations.sensors.subscribe(sensors)
+    try:
+        assert wait_for_sample(animations.sensors, "gpu") is not None
+        assert wait_for_sample(animations.sensors, "cpu") is not None
+        lines = animations.show_gpu_cpu_ram()
+    finally:
+        animations.sensors.unsubscribe(sensors)
+
+    assert lines[0] == "GPU: 42%"
+    assert lines[1].startswith("CPU: ") and lines[1] != "CPU: N/A"
+    assert lines[2].startswith("RAM: ") and lines[2] != "RAM: N/A"
+
+def test_temperatures_on_fake_backend(animations):
+    sensors = get_preset("temperatures").sensors
+    animations.sensors.subscribe(sensors)
+    try:
+        assert wait_for_sample(animations.sensors, "gpu") is not None
+        lines = animations.show_temperatures()
+    finally:
+        animations.sensors.unsubscribe(sensors)
+
+    assert lines[1] == "GPU: 67°C"
+    assert lines[2] == "Temperatures"
+
+def test_backend_closed_when_last_subscriber_leaves(animations, backends):
+    animations.sensors.subscribe(["gpu"])
+    assert wait_for_sample(animations.sensors, "gpu") is not None
+    animations.sensors.subscribe(["gpu"])
+    animations.sensors.unsubscribe(["gpu"])
+    time.sleep(0.1)
+    assert len(backends) == 1 and not backends[0].closed
+
+    animations.sensors.unsubscribe(["gpu"])
+    deadline = time.monotonic() + 2.0
+    while not backends[0].closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backends[0].closed
+    assert animations.gpu is None
+
+    # The next subscriber gets a fresh backend from the factory
+    animations.sensors.subscribe(["gpu"])
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(backends) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(backends) == 2
+    finally:
+        animations.sensors.unsubscribe(["gpu"])
+
+def test_close_releases_backend(animations, backends):
+    animations.sample_gpu()
+    animations.close()
+    assert backends[0].closed
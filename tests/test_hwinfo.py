@@ -0,0 +1,94 @@
+import pytest
+
+from hwinfo import (HWiNFOReader, HEADER, SENSOR, READING, VALUE, HWINFO_SIGNATURE,
+                    READING_TEMPERATURE, READING_USAGE, READING_FAN)
+
+def build_image(sensors, readings, padding=8):
+    # Same packed layout HWiNFO publishes, with a larger record size than the struct
+    # so the reader has to honour the header's sizes instead of assuming them
+    sensor_offset = HEADER.size
+    sensor_size = SENSOR.size + padding
+    reading_offset = sensor_offset + sensor_size * len(sensors)
+    reading_size = READING.size + VALUE.size + padding
+
+    image = bytearray(reading_offset + reading_size * len(readings))
+    HEADER.pack_into(image, 0, HWINFO_SIGNATURE, 2, 0, 0, sensor_offset, sensor_size, len(sensors),
+                     reading_offset, reading_size, len(readings))
+    for i, (name_orig, name_user) in enumerate(sensors):
+        SENSOR.pack_into(image, sensor_offset + i * sensor_size, i, 0, name_orig, name_user)
+    for i, (reading_type, sensor_index, label, unit, value) in enumerate(readings):
+        offset = reading_offset + i * reading_size
+        READING.pack_into(image, offset, reading_type, sensor_index, i, label, b"", unit)
+        VALUE.pack_into(image, offset + READING.size, value)
+    return bytes(image)
+
+SENSORS = [(b"CPU [#0]: AMD Ryzen 7 5800X", b""), (b"GPU [#0]: NVIDIA GeForce RTX 3080", b"My GPU")]
+READINGS = [
+    (READING_USAGE, 0, b"Total CPU Usage", b"%", 12.5),
+    (READING_TEMPERATURE, 0, b"CPU (Tctl/Tdie)", b"\xb0C", 61.25),
+    (READING_TEMPERATURE, 1, b"GPU Temperature", b"\xb0C", 48.0),
+    (READING_FAN, 1, b"GPU Fan1", b"RPM", 1200.0),
+]
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "hwinfo.bin"
+    path.write_bytes(build_image(SENSORS, READINGS))
+    return path
+
+@pytest.fixture
+def reader(image_path):
+    reader = HWiNFOReader(path=str(image_path))
+    reader.open()
+    yield reader
+    reader.close()
+
+def test_header_and_index(reader):
+    assert len(reader.readings) == len(READINGS)
+    assert [r.label for r in reader.readings] == ["Total CPU Usage", "CPU (Tctl/Tdie)", "GPU Temperature", "GPU Fan1"]
+    assert reader.readings[0].sensor_name == "CPU [#0]: AMD Ryzen 7 5800X"
+    # A user-assigned sensor name wins over the original one
+    assert reader.readings[2].sensor_name == "My GPU"
+    assert reader.readings[1].unit == "°C"
+
+def test_find_and_value(reader):
+    cpu = reader.find(READING_TEMPERATURE, "CPU", "TCTL")
+    assert cpu is not None and reader.value(cpu) == 61.25
+
+    gpu = reader.find(READING_TEMPERATURE, "GPU")
+    assert gpu.label == "GPU Temperature" and reader.value(gpu) == 48.0
+
+    # Type must match as well as the keywords
+    assert reader.find(READING_USAGE, "GPU") is None
+    assert reader.find(READING_TEMPERATURE, "MOTHERBOARD") is None
+
+def test_value_follows_live_updates(reader, image_path):
+    cpu = reader.find(READING_TEMPERATURE, "CPU")
+    with open(image_path, "r+b") as f:
+        f.seek(cpu.value_offset)
+        f.write(VALUE.pack(70.5))
+    assert reader.value(cpu) == 70.5
+    assert not reader.is_stale()
+
+def test_stale_after_layout_change(reader, image_path):
+    assert not reader.is_stale()
+    # HWiNFO restarted with one sensor fewer: same file, new header
+    with open(image_path, "r+b") as f:
+        f.write(build_image(SENSORS[:1], READINGS[:2])[:HEADER.size])
+    assert reader.is_stale()
+
+def test_rejects_missing_signature(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(bytes(HEADER.size))
+    reader = HWiNFOReader(path=str(path))
+    with pytest.raises(ValueError):
+        reader.open()
+    reader.close()
+
+def test_rejects_truncated_image(tmp_path):
+    path = tmp_path / "short.bin"
+    path.write_bytes(build_image(SENSORS, READINGS)[:-20])
+    reader = HWiNFOReader(path=str(path))
+    with pytest.raises(ValueError):
+        reader.open()
+    reader.close()
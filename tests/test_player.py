@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+import player
+from config import DEFAULT_SPEED_MS, MIN_SPEED_MS, MAX_SPEED_MS
+from player import Player, Playlist, clamp_speed, static_program
+from sensors import SensorHub
+
+@pytest.mark.parametrize("value, expected", [
+    (0, MIN_SPEED_MS), (-50, MIN_SPEED_MS), (10 ** 6, MAX_SPEED_MS), (120, 120),
+    (float("nan"), DEFAULT_SPEED_MS), (float("inf"), DEFAULT_SPEED_MS), ("80", 80),
+])
+def test_clamp_speed(value, expected):
+    assert clamp_speed(value) == expected
+
+class Output:
+    def __init__(self):
+        self.frames = []
+        self.condition = threading.Condition()
+
+    def __call__(self, lines):
+        with self.condition:
+            self.frames.append(tuple(lines))
+            self.condition.notify_all()
+
+    def wait_for(self, lines, timeout=2.0):
+        with self.condition:
+            return self.condition.wait_for(lambda: self.frames and self.frames[-1] == tuple(lines), timeout)
+
+@pytest.fixture
+def output():
+    return Output()
+
+def test_bad_speed_does_not_break_later_presets(output):
+    p = Player(SensorHub(), output)
+    p.start()
+    try:
+        for speed in (0, -1, float("nan")):
+            p.set_speed(speed)
+            assert p.speed_ms > 0
+        p.play(lambda: static_program("a", ["1", "2", "3"]))
+        assert output.wait_for(["1", "2", "3"])
+        assert p.thread.is_alive()
+    finally:
+        p.stop()
+
+def test_loop_survives_playlist_item_that_stops_building(output, monkeypatch):
+    monkeypatch.setattr(player, "PLAYLIST_PREWARM_S", 0.05)
+    builds = []
+
+    def build(preset_id):
+        builds.append(preset_id)
+        if len(builds) > 1:
+            raise IOError("clip deleted")
+        return static_program(preset_id, ["x", "y", "z"])
+
+    p = Player(SensorHub(), output, build)
+    p.set_speed(MIN_SPEED_MS)
+    p.start()
+    try:
+        p.play_playlist(Playlist([("only", 0.2)], "cut"))
+        assert output.wait_for(["x", "y", "z"])
+        assert output.wait_for(["", "", ""])
+        assert p.thread.is_alive()
+
+        p.play(lambda: static_program("b", ["4", "5", "6"]))
+        assert output.wait_for(["4", "5", "6"])
+    finally:
+        p.stop()
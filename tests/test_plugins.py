@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PLUGIN = textwrap.dedent('''
+    PRESETS = {
+        "clock": {"name": "Fake Clock", "category": "System", "factory": "create_clock"},
+        "starfield_test": {"name": "Starfield", "category": "Community", "factory": "create_starfield"},
+    }
+
+    def create_clock(animations):
+        return lambda: ["plugin", "clock", ""]
+
+    def create_starfield(animations):
+        def starfield():
+            return ["*" * 3, "", ""]
+        return starfield
+''')
+
+@pytest.fixture
+def plugins_dir(tmp_path):
+    (tmp_path / "community.py").write_text(PLUGIN)
+    return tmp_path
+
+def run_fresh(code, plugins_dir):
+    # A fresh interpreter, so nothing has imported animations before register_plugins
+    result = subprocess.run([sys.executable, "-c", code, str(plugins_dir)], cwd=ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+def test_plugin_cannot_replace_builtin_when_registered_first(plugins_dir):
+    out = run_fresh(textwrap.dedent('''
+        import sys
+        from plugins import register_plugins
+        from registry import get_preset
+        print(register_plugins(sys.argv[1]))
+        print(get_preset("clock").func, get_preset("clock").module)
+        print(get_preset("starfield_test").module)
+    '''), plugins_dir)
+    count, clock, starfield = out.strip().splitlines()[-3:]
+    assert count == "1"
+    assert clock == "show_clock None"
+    assert starfield == "nova_plugins.community"
+
+def test_plugin_module_imported_only_on_first_use(plugins_dir):
+    out = run_fresh(textwrap.dedent('''
+        import sys
+        from plugins import register_plugins
+        from registry import get_preset
+        from animations import AnimationFunctions
+        register_plugins(sys.argv[1])
+        print("nova_plugins.community" in sys.modules)
+        func = AnimationFunctions(1).resolve(get_preset("starfield_test"))
+        print("nova_plugins.community" in sys.modules, func())
+    '''), plugins_dir)
+    before, after = out.strip().splitlines()[-2:]
+    assert before == "False"
+    assert after == "True ['***', '', '']"
@@ -0,0 +1,19 @@
+import animations  # registers the built-in presets
+from registry import presets_by_category
+
+# Button order of the original hand-written preset table
+EXPECTED = {
+    "Animations": ["japanese_rain", "regular_rain", "snowflake", "pulse", "sparkle", "rainbow", "fire", "wave",
+                   "glitch", "binary"],
+    "Gaming": ["loading", "radar", "snake"],
+    "Anime": ["anime_faces", "anime_sparkle", "cat_standing", "cat_walking", "mouse_running"],
+    "System": ["clock", "gpu_cpu_ram", "ram_net_uptime", "temperatures"],
+}
+
+def test_builtin_button_order():
+    categories = presets_by_category()
+    for category, preset_ids in EXPECTED.items():
+        assert list(categories[category])[:len(preset_ids)] == preset_ids
+
+def test_category_order():
+    assert list(presets_by_category())[:5] == ["Animations", "Gaming", "Anime", "System", "Mixes"]
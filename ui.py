@@ -4,7 +4,7 @@ import platform
 from config import *
 
 class NovaUI:
-    def __init__(self, root, controller, on_preset_load, on_custom_send, on_clear, on_stop, on_speed_change, on_speed_release=None):
+    def __init__(self, root, controller, on_preset_load, on_custom_send, on_clear, on_stop, on_speed_change, on_speed_release=None, on_playlist=None):
         self.root = root
         self.controller = controller
         self.on_preset_load = on_preset_load
@@ -13,6 +13,7 @@ class NovaUI:
         self.on_stop = on_stop
         self.on_speed_change = on_speed_change
         self.on_speed_release = on_speed_release
+        self.on_playlist = on_playlist
         
         self.preset_buttons = {}
         self.all_presets = {}
@@ -62,6 +63,7 @@ class NovaUI:
         self.oled_frame.pack(padx=20, pady=10)
         
         self.preview_lines = []
+        self.preview_text = ["", "", ""]
         for i in range(3):
             label = ctk.CTkLabel(
                 self.oled_frame,
@@ -100,6 +102,9 @@ class NovaUI:
         
         ctk.CTkButton(btn_frame, text="Clear", command=self.on_clear, width=120).pack(side="left", padx=5)
         
+        if self.on_playlist:
+            ctk.CTkButton(btn_frame, text="Playlist", command=self.on_playlist, width=120).pack(side="left", padx=5)
+        
         settings_frame = ctk.CTkFrame(right)
         settings_frame.pack(fill="x", padx=20, pady=10)
         
@@ -110,6 +115,12 @@ class NovaUI:
         self.auto_start.pack(pady=5)
         self.auto_start.select()
         
+        self.replay = ctk.CTkCheckBox(
+            settings_frame,
+            text="Replay recorded animation seed"
+        )
+        self.replay.pack(pady=5)
+        
         speed_frame = ctk.CTkFrame(settings_frame)
         speed_frame.pack(fill="x", pady=10)
         
@@ -126,6 +137,9 @@ class NovaUI:
         self.speed_label = ctk.CTkLabel(speed_frame, text=f"{DEFAULT_SPEED_MS}ms")
         self.speed_label.pack(side="left", padx=10)
         
+        self.frame_stats_label = ctk.CTkLabel(speed_frame, text="", font=("Arial", 10), text_color="gray", width=110)
+        self.frame_stats_label.pack(side="left", padx=(0, 10))
+        
         footer_frame = ctk.CTkFrame(self.root)
         footer_frame.pack(side="bottom", fill="x", pady=5)
         
@@ -149,6 +163,15 @@ class NovaUI:
         self.speed_label.configure(text=f"{int(value)}ms")
         self.on_speed_change(value)
     
+    def update_frame_stats(self, fps, jitter_ms=0.0):
+        if fps is None:
+            self.frame_stats_label.configure(text="")
+        else:
+            self.frame_stats_label.configure(text=f"{fps:.1f} fps ±{jitter_ms:.1f}ms")
+    
+    def set_speed_enabled(self, enabled):
+        self.speed_slider.configure(state="normal" if enabled else "disabled")
+    
     def set_presets(self, presets):
         self.all_presets = presets
         
@@ -182,7 +205,9 @@ class NovaUI:
             l3.replace(' ', BLANK_SPACE_CHAR)
         ]
         for i, label in enumerate(self.preview_lines):
-            label.configure(text=lines[i])
+            if lines[i] != self.preview_text[i]:
+                label.configure(text=lines[i])
+                self.preview_text[i] = lines[i]
     
     def preview_custom(self, event=None):
         lines = [e.get()[:CHAR_LIMIT] for e in self.line_entries]
@@ -0,0 +1,145 @@
+import os
+import select
+import struct
+import sys
+import threading
+from config import CORE_PROPS_POLL_S
+from controller import core_props_path, read_server_url
+
+# inotify(7) constants, Linux only
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE |
+              IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+# Bounds how long stop() waits for the inotify loop to notice
+SELECT_TIMEOUT_S = 0.25
+
+def open_inotify(directory):
+    # Returns (fd, None) or (None, reason); the caller polls when inotify is unavailable
+    if not sys.platform.startswith("linux"):
+        return None, "not Linux"
+    if not os.path.isdir(directory):
+        return None, f"{directory} does not exist yet"
+
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None, os.strerror(ctypes.get_errno())
+        # Watch the directory: Engine replaces the file rather than editing it in place
+        if libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK) < 0:
+            error = os.strerror(ctypes.get_errno())
+            os.close(fd)
+            return None, error
+        return fd, None
+    except (OSError, AttributeError) as e:
+        return None, str(e)
+
+def read_events(fd):
+    try:
+        data = os.read(fd, 4096)
+    except BlockingIOError:
+        return []
+
+    events = []
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(data):
+        wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+        offset += EVENT_HEADER.size
+        name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+        offset += length
+        events.append((mask, name))
+    return events
+
+class CorePropsWatcher:
+    def __init__(self, on_change, path=None, interval=CORE_PROPS_POLL_S):
+        self.on_change = on_change
+        self.path = path or core_props_path()
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+        self.url = read_server_url(self.path)
+        self.mode = None
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True, name="CorePropsWatcher")
+        self.thread.start()
+
+    def stop(self, timeout=1.0):
+        self.stopped.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+        self.thread = None
+
+    def check(self):
+        url = read_server_url(self.path)
+        if url is None or url == self.url:
+            return
+        self.url = url
+        try:
+            self.on_change(url)
+        except Exception as e:
+            print(f"coreProps.json change handler failed: {e}")
+
+    def run(self):
+        while not self.stopped.is_set():
+            fd, reason = open_inotify(os.path.dirname(self.path))
+            if fd is None:
+                if self.mode != "poll":
+                    print(f"Polling {self.path} every {self.interval}s ({reason})")
+                self.mode = "poll"
+                self.poll()
+            else:
+                self.mode = "inotify"
+                try:
+                    self.watch(fd)
+                finally:
+                    os.close(fd)
+
+    def poll(self):
+        # Runs until the directory appears on Linux, so inotify can take over
+        last = None
+        while not self.stopped.wait(self.interval):
+            try:
+                stat = os.stat(self.path)
+                current = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                current = None
+            if current != last:
+                last = current
+                self.check()
+            if sys.platform.startswith("linux") and os.path.isdir(os.path.dirname(self.path)):
+                return
+
+    def watch(self, fd):
+        # The file may have changed between the last read and the watch being added
+        self.check()
+        name = os.path.basename(self.path)
+        while not self.stopped.is_set():
+            ready, _, _ = select.select([fd], [], [], SELECT_TIMEOUT_S)
+            if not ready:
+                continue
+
+            changed = False
+            for mask, event_name in read_events(fd):
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    # The directory itself went away, fall back to polling until it is back
+                    return
+                if event_name == name:
+                    changed = True
+            if changed:
+                self.check()